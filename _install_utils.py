@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Outils communs aux scripts d'installation
+pip (uv ou sous-processus pip), vérification des exigences,
+imports Selenium / webdriver-manager et cache ChromeDriver
+"""
+
+import os
+import re
+import sys
+import shutil
+import logging
+import importlib
+import subprocess
+from importlib.metadata import version, PackageNotFoundError
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+def run_quiet(command):
+    """Lance une commande sans conserver stdout ; stderr n'est journalisé qu'en cas d'échec"""
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0 and result.stderr:
+        logger.error(result.stderr.strip())
+    return result.returncode
+
+def run_pip(args):
+    """Exécute pip et retourne son code de sortie.
+
+    Utilise `uv pip` s'il est présent sur le PATH, sinon `python -m pip` dans un
+    sous-processus (pip en processus reconfigurerait la journalisation du script).
+    """
+    if shutil.which('uv'):
+        return run_quiet(['uv', 'pip', args[0], '--python', sys.executable, *args[1:]])
+    return run_quiet([sys.executable, '-m', 'pip', *args])
+
+def satisfied(requirement):
+    """Vérifie si une exigence pip (ex: 'selenium>=4.15.0') est déjà satisfaite"""
+    try:
+        from packaging.requirements import Requirement
+        req = Requirement(requirement)
+        return req.specifier.contains(version(req.name), prereleases=True)
+    except (ImportError, PackageNotFoundError, ValueError):
+        return False
+
+def installed_version(requirement):
+    """Version installée du paquet d'une exigence pip (ex: 'selenium>=4.15.0'), None s'il est absent"""
+    name = re.split(r'[<>=!~;\[\s]', requirement, 1)[0]
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return None
+
+# Imports Selenium / webdriver-manager centralisés : chargés une seule fois,
+# et retentés après l'installation des dépendances s'ils manquaient au démarrage
+webdriver = ChromeOptions = EdgeOptions = None
+ChromeDriverManager = EdgeChromiumDriverManager = None
+SELENIUM_OK = False
+SELENIUM_IMPORT_ERROR = None
+
+def import_selenium():
+    """Importe Selenium et webdriver-manager au niveau du module"""
+    global webdriver, ChromeOptions, EdgeOptions, ChromeDriverManager, EdgeChromiumDriverManager
+    global SELENIUM_OK, SELENIUM_IMPORT_ERROR
+    importlib.invalidate_caches()
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        from selenium.webdriver.edge.options import Options as EdgeOptions
+        from webdriver_manager.chrome import ChromeDriverManager
+        from webdriver_manager.microsoft import EdgeChromiumDriverManager
+        SELENIUM_OK = True
+    except ImportError as e:
+        SELENIUM_OK = False
+        SELENIUM_IMPORT_ERROR = e
+    return SELENIUM_OK
+
+import_selenium()
+
+def cached_chromedriver():
+    """Retourne le ChromeDriver le plus récent du cache webdriver-manager, ou None"""
+    root = Path(sys.path[0]) if os.environ.get('WDM_LOCAL') == '1' else Path.home()
+    drivers_dir = root / '.wdm' / 'drivers' / 'chromedriver'
+    candidates = [
+        path
+        for name in ('chromedriver', 'chromedriver.exe')
+        for path in drivers_dir.glob(f'**/{name}')
+        if path.is_file() and os.access(path, os.X_OK)
+    ]
+    if not candidates:
+        return None
+    return str(max(candidates, key=lambda path: path.stat().st_mtime))
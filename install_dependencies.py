@@ -7,8 +7,8 @@ Usage: python install_dependencies.py
 
 import os
 import sys
-import subprocess
 from auto_installer import run_auto_installer
+from _install_utils import run_pip
 
 def main():
     """Point d'entrée principal pour l'installation"""
@@ -30,14 +30,12 @@ def main():
     if os.path.exists('requirements.txt'):
         print("\n📦 Installation des dépendances de base...")
         try:
-            result = subprocess.run([
-                sys.executable, '-m', 'pip', 'install', '-r', 'requirements.txt'
-            ], capture_output=True, text=True)
+            returncode = run_pip(['install', '-r', 'requirements.txt'])
             
-            if result.returncode == 0:
+            if returncode == 0:
                 print("✅ Dépendances de base installées avec succès")
             else:
-                print(f"⚠️ Avertissement lors de l'installation: {result.stderr}")
+                print(f"⚠️ Avertissement lors de l'installation: pip a retourné le code {returncode}")
         except Exception as e:
             print(f"❌ Erreur lors de l'installation des dépendances de base: {str(e)}")
     
@@ -5,17 +5,100 @@ Ce script configure automatiquement toutes les dépendances nécessaires
 
 import os
 import sys
-import subprocess
 import logging
+import logging.handlers
 import platform
+import hashlib
 import json
+from importlib.metadata import version, PackageNotFoundError
+from importlib.util import find_spec
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
-# Configuration du logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Cache webdriver-manager partagé : les drivers téléchargés atterrissent dans
+# <projet>/.wdm, réutilisé par install_searx_visual_deps.py
+os.environ.setdefault('WDM_LOCAL', '1')
+os.environ.setdefault('WDM_SSL_VERIFY', '1')
+
+import _install_utils as deps
+from _install_utils import run_pip as _pip, satisfied as _satisfied, installed_version
+
+# Configuration du logging : les messages sont regroupés en mémoire et écrits
+# par lots (fin de phase, erreur ou buffer plein) plutôt qu'une ligne à la fois
+_log_stream = logging.StreamHandler(sys.stderr)
+_log_stream.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_buffer = logging.handlers.MemoryHandler(capacity=64, flushLevel=logging.ERROR, target=_log_stream)
+if not logging.getLogger().handlers:
+    logging.getLogger().addHandler(_log_buffer)
+    logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger('InteractiveInstaller')
 
+_now = time.time
+
+# Informations plateforme déterminées une seule fois à l'import
+_PLATFORM = platform.system()
+_IS_WINDOWS = _PLATFORM == 'Windows'
+_ARCHITECTURE = platform.architecture()[0]
+
+# Dépendances de base du système de navigation interactive
+_BASE_PACKAGES = (
+    'selenium>=4.15.0',
+    'webdriver-manager>=4.0.0',
+    'requests>=2.31.0',
+    'beautifulsoup4>=4.12.0',
+    'lxml>=4.9.0',
+    'Pillow>=10.0.0'
+)
+
+# Configuration par défaut écrite par create_configuration_file
+_CONFIG_TEMPLATE = {
+    'interactive_navigation': {
+        'enabled': True,
+        'preferred_browser': 'chrome',
+        'default_timeout': 30,
+        'screenshot_enabled': True,
+        'max_interactions_per_session': 50
+    },
+    'webdriver_settings': {
+        'headless': True,
+        'window_size': (1920, 1080),
+        'page_load_timeout': 15,
+        'implicit_wait': 5
+    },
+    'detection_settings': {
+        'confidence_threshold': 0.6,
+        'interaction_keywords': {
+            'click': ('clique', 'cliquer', 'appuie', 'appuyer'),
+            'navigate': ('explore', 'parcours', 'navigue'),
+            'analyze': ('analyse', 'regarde', 'examine')
+        }
+    },
+    'safety_settings': {
+        'respect_robots_txt': True,
+        'interaction_delay': 1.0,
+        'max_session_duration': 300
+    }
+}
+
+# État persistant des phases réussies, pour ne pas les rejouer à l'identique
+_INSTALL_STATE_PATH = Path('.install_state.json')
+_INSTALL_STATE_MAX_AGE = 7 * 24 * 3600
+
+# Les fichiers JSON sont sérialisés en mémoire puis écrits en un seul appel
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Sérialisation JSON rapide si orjson est disponible (même format indenté)
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 class InteractiveNavigationInstaller:
     """Installeur automatique pour le système de navigation interactive"""
     
@@ -23,19 +106,53 @@ class InteractiveNavigationInstaller:
         self.installation_log = []
         self.errors = []
         self.system_info = {
-            'platform': platform.system(),
+            'platform': _PLATFORM,
             'python_version': sys.version,
-            'architecture': platform.architecture()[0]
+            'architecture': _ARCHITECTURE
         }
         
         logger.info(f"🚀 Démarrage de l'installation sur {self.system_info['platform']}")
+        
+        self.install_state = self._load_install_state()
+    
+    def _load_install_state(self):
+        """Charge l'état des phases réussies lors d'une installation précédente"""
+        try:
+            with open(_INSTALL_STATE_PATH, 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+    
+    def _phase_key(self, step_name):
+        """Empreinte des entrées d'une phase coûteuse, None si la phase n'est pas mise en cache"""
+        if step_name == 'Installation Dépendances':
+            # Versions installées incluses : un paquet désinstallé ou rétrogradé invalide le cache
+            installed = tuple(installed_version(requirement) for requirement in _BASE_PACKAGES)
+            inputs = (_BASE_PACKAGES, sys.version, installed)
+        elif step_name == 'Vérification WebDrivers':
+            try:
+                selenium_version = version('selenium')
+            except PackageNotFoundError:
+                return None
+            inputs = (_PLATFORM, _ARCHITECTURE, selenium_version)
+        else:
+            return None
+        return hashlib.sha1(repr(inputs).encode('utf-8')).hexdigest()
+    
+    def _phase_cached(self, step_name, key):
+        """Indique si la phase a déjà réussi récemment avec les mêmes entrées"""
+        entry = self.install_state.get(step_name)
+        return (
+            entry is not None
+            and entry.get('status') == 'SUCCESS'
+            and entry.get('hash') == key
+            and _now() - entry.get('timestamp', 0) < _INSTALL_STATE_MAX_AGE
+        )
     
     def log_step(self, step_name: str, success: bool, message: str = ""):
-        """Enregistre une étape d'installation"""
-        timestamp = datetime.now().isoformat()
-        
+        """Enregistre une étape d'installation (horodatage ISO calculé au rapport)"""
         entry = {
-            'timestamp': timestamp,
+            'timestamp': _now(),
             'step': step_name,
             'success': success,
             'message': message
@@ -44,11 +161,20 @@ class InteractiveNavigationInstaller:
         self.installation_log.append(entry)
         
         if success:
-            logger.info(f"✅ {step_name}: {message}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(f"✅ {step_name}: {message}")
         else:
             logger.error(f"❌ {step_name}: {message}")
             self.errors.append(entry)
     
+    @staticmethod
+    def _serialize_entries(entries):
+        """Convertit les horodatages epoch des entrées en ISO 8601"""
+        return [
+            {**entry, 'timestamp': datetime.fromtimestamp(entry['timestamp']).isoformat()}
+            for entry in entries
+        ]
+    
     def check_python_version(self):
         """Vérifie la version de Python"""
         logger.info("🐍 Vérification de la version Python...")
@@ -69,26 +195,23 @@ class InteractiveNavigationInstaller:
         """Installe les dépendances de base"""
         logger.info("📦 Installation des dépendances de base...")
         
-        base_packages = [
-            'selenium>=4.15.0',
-            'webdriver-manager>=4.0.0',
-            'requests>=2.31.0',
-            'beautifulsoup4>=4.12.0',
-            'lxml>=4.9.0',
-            'Pillow>=10.0.0'
-        ]
-        
         try:
-            for package in base_packages:
+            needed = []
+            for package in _BASE_PACKAGES:
+                if _satisfied(package):
+                    self.log_step(f"Installation {package.split('>=')[0]}", True, "Déjà installé")
+                else:
+                    needed.append(package)
+            
+            for package in needed:
                 logger.info(f"   Instalation de {package}...")
-                result = subprocess.run([
-                    sys.executable, '-m', 'pip', 'install', package
-                ], capture_output=True, text=True)
+                returncode = _pip(['install', package])
                 
-                if result.returncode == 0:
+                if returncode == 0:
                     self.log_step(f"Installation {package.split('>=')[0]}", True, "Package installé")
                 else:
-                    self.log_step(f"Installation {package.split('>=')[0]}", False, result.stderr)
+                    self.log_step(f"Installation {package.split('>=')[0]}", False,
+                                  f"pip a retourné le code {returncode}")
                     return False
             
             return True
@@ -97,6 +220,57 @@ class InteractiveNavigationInstaller:
             self.log_step("Installation Dépendances Base", False, str(e))
             return False
     
+    def _probe_chrome(self):
+        """Teste le lancement de ChromeDriver, retourne (nom, succès, message)"""
+        try:
+            chrome_options = deps.ChromeOptions()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            
+            # Tenter d'initialiser ChromeDriver, binaire en cache d'abord
+            cached_path = deps.cached_chromedriver()
+            try:
+                driver = deps.webdriver.Chrome(
+                    service=deps.webdriver.chrome.service.Service(cached_path or deps.ChromeDriverManager().install()),
+                    options=chrome_options)
+            except Exception:
+                if cached_path is None:
+                    raise
+                # Binaire en cache obsolète (Chrome mis à jour) : réinstallation
+                driver = deps.webdriver.Chrome(
+                    service=deps.webdriver.chrome.service.Service(deps.ChromeDriverManager().install()),
+                    options=chrome_options)
+            try:
+                driver.get('about:blank')
+            finally:
+                driver.quit()
+            
+            return 'chrome', True, "ChromeDriver opérationnel"
+            
+        except Exception as e:
+            return 'chrome', False, f"Erreur: {str(e)}"
+    
+    def _probe_edge(self):
+        """Teste le lancement d'EdgeDriver, retourne (nom, succès, message)"""
+        try:
+            edge_options = deps.EdgeOptions()
+            edge_options.add_argument('--headless')
+            edge_options.add_argument('--no-sandbox')
+            
+            driver_path = deps.EdgeChromiumDriverManager().install()
+            driver = deps.webdriver.Edge(service=deps.webdriver.edge.service.Service(driver_path),
+                                  options=edge_options)
+            try:
+                driver.get('about:blank')
+            finally:
+                driver.quit()
+            
+            return 'edge', True, "EdgeDriver opérationnel"
+            
+        except Exception as e:
+            return 'edge', False, f"Erreur: {str(e)}"
+    
     def check_webdriver_availability(self):
         """Vérifie la disponibilité des WebDrivers"""
         logger.info("🌐 Vérification des WebDrivers...")
@@ -106,50 +280,27 @@ class InteractiveNavigationInstaller:
             'edge': False,
             'firefox': False
         }
+        display_names = {
+            'chrome': "Chrome WebDriver",
+            'edge': "Edge WebDriver"
+        }
         
-        # Test Chrome
-        try:
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options as ChromeOptions
-            from webdriver_manager.chrome import ChromeDriverManager
-            
-            chrome_options = ChromeOptions()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            
-            # Tenter d'initialiser ChromeDriver
-            driver_path = ChromeDriverManager().install()
-            driver = webdriver.Chrome(service=webdriver.chrome.service.Service(driver_path), 
-                                    options=chrome_options)
-            driver.quit()
-            
-            drivers_available['chrome'] = True
-            self.log_step("Chrome WebDriver", True, "ChromeDriver opérationnel")
-            
-        except Exception as e:
-            self.log_step("Chrome WebDriver", False, f"Erreur: {str(e)}")
+        if not deps.SELENIUM_OK and not deps.import_selenium():
+            self.log_step("WebDrivers Globaux", False,
+                         f"Selenium/webdriver-manager indisponible: {deps.SELENIUM_IMPORT_ERROR}")
+            return False
         
-        # Test Edge (si sur Windows)
-        if self.system_info['platform'] == 'Windows':
-            try:
-                from selenium.webdriver.edge.options import Options as EdgeOptions
-                from webdriver_manager.microsoft import EdgeChromiumDriverManager
-                
-                edge_options = EdgeOptions()
-                edge_options.add_argument('--headless')
-                edge_options.add_argument('--no-sandbox')
-                
-                driver_path = EdgeChromiumDriverManager().install()
-                driver = webdriver.Edge(service=webdriver.edge.service.Service(driver_path),
-                                      options=edge_options)
-                driver.quit()
-                
-                drivers_available['edge'] = True
-                self.log_step("Edge WebDriver", True, "EdgeDriver opérationnel")
-                
-            except Exception as e:
-                self.log_step("Edge WebDriver", False, f"Erreur: {str(e)}")
+        # Chrome toujours, Edge seulement sur Windows ; les sondes tournent en parallèle
+        probes = [self._probe_chrome]
+        if _IS_WINDOWS:
+            probes.append(self._probe_edge)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(probe) for probe in probes]
+            for future in as_completed(futures):
+                name, success, message = future.result()
+                drivers_available[name] = success
+                self.log_step(display_names[name], success, message)
         
         # Résumé
         available_count = sum(drivers_available.values())
@@ -175,8 +326,10 @@ class InteractiveNavigationInstaller:
         
         for module_name, display_name in modules_to_test:
             try:
-                __import__(module_name)
-                self.log_step(f"Import {display_name}", True, "Module importé avec succès")
+                # Localise le module sans exécuter son code
+                if find_spec(module_name) is None:
+                    raise ImportError(f"No module named '{module_name}'")
+                self.log_step(f"Import {display_name}", True, "Module disponible")
                 successful_imports += 1
                 
             except ImportError as e:
@@ -195,32 +348,7 @@ class InteractiveNavigationInstaller:
         logger.info("⚙️ Création du fichier de configuration...")
         
         config = {
-            'interactive_navigation': {
-                'enabled': True,
-                'preferred_browser': 'chrome',
-                'default_timeout': 30,
-                'screenshot_enabled': True,
-                'max_interactions_per_session': 50
-            },
-            'webdriver_settings': {
-                'headless': True,
-                'window_size': [1920, 1080],
-                'page_load_timeout': 15,
-                'implicit_wait': 5
-            },
-            'detection_settings': {
-                'confidence_threshold': 0.6,
-                'interaction_keywords': {
-                    'click': ['clique', 'cliquer', 'appuie', 'appuyer'],
-                    'navigate': ['explore', 'parcours', 'navigue'],
-                    'analyze': ['analyse', 'regarde', 'examine']
-                }
-            },
-            'safety_settings': {
-                'respect_robots_txt': True,
-                'interaction_delay': 1.0,
-                'max_session_duration': 300
-            },
+            **_CONFIG_TEMPLATE,
             'installation_info': {
                 'installed_on': datetime.now().isoformat(),
                 'system_info': self.system_info,
@@ -230,8 +358,9 @@ class InteractiveNavigationInstaller:
         
         try:
             config_path = Path('interactive_navigation_config.json')
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            data = _dumps(config)
+            with open(config_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(data)
             
             self.log_step("Configuration", True, f"Fichier créé: {config_path}")
             return True
@@ -308,16 +437,20 @@ class InteractiveNavigationInstaller:
                 'success_rate': success_rate,
                 'overall_status': 'SUCCESS' if success_rate >= 80 else 'PARTIAL' if success_rate >= 50 else 'FAILED'
             },
-            'installation_log': self.installation_log,
-            'errors': self.errors,
+            'installation_log': self._serialize_entries(self.installation_log),
+            'errors': self._serialize_entries(self.errors),
             'recommendations': self._generate_recommendations()
         }
         
         # Sauvegarder le rapport
         try:
             report_path = Path(f'installation_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-            with open(report_path, 'w', encoding='utf-8') as f:
-                json.dump(report, f, indent=2, ensure_ascii=False)
+            data = _dumps(report)
+            with open(report_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+                f.write(data)
+            
+            with open(_INSTALL_STATE_PATH, 'wb') as f:
+                f.write(_dumps(self.install_state))
             
             self.log_step("Rapport Installation", True, f"Rapport sauvegardé: {report_path}")
         
@@ -386,13 +519,26 @@ class InteractiveNavigationInstaller:
         
         for step_name, step_function in installation_steps:
             logger.info(f"\n🔄 {step_name}...")
+            key = self._phase_key(step_name)
+            if key and self._phase_cached(step_name, key):
+                self.log_step(step_name, True, "SUCCESS en cache (entrées inchangées)")
+                continue
             try:
                 success = step_function()
+                if success and key:
+                    self.install_state[step_name] = {
+                        # Empreinte recalculée : la phase a pu installer ou mettre à jour des paquets
+                        'hash': self._phase_key(step_name),
+                        'status': 'SUCCESS',
+                        'timestamp': _now()
+                    }
                 if not success:
                     logger.warning(f"⚠️ {step_name} a échoué, mais l'installation continue...")
             except Exception as e:
                 logger.error(f"❌ Erreur critique dans {step_name}: {e}")
                 self.log_step(step_name, False, f"Erreur critique: {str(e)}")
+            finally:
+                _log_buffer.flush()
         
         installation_time = (datetime.now() - start_time).total_seconds()
         
@@ -428,6 +574,7 @@ class InteractiveNavigationInstaller:
             logger.info("💬 Certaines fonctionnalités peuvent être limitées")
         
         logger.info("=" * 80)
+        _log_buffer.flush()
         
         return report
 
@@ -461,3 +608,5 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"❌ Erreur critique lors de l'installation: {e}")
         sys.exit(1)
+    finally:
+        _log_buffer.flush()
@@ -3,27 +3,29 @@
 Installation des dépendances pour le système Searx
 """
 
-import subprocess
 import sys
 import logging
 
+from _install_utils import run_pip as _pip, satisfied as _satisfied
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('searx_deps_installer')
 
 def install_package(package_name):
     """Installe un package Python avec pip"""
-    try:
-        logger.info(f"Installation de {package_name}...")
-        result = subprocess.run([
-            sys.executable, '-m', 'pip', 'install', package_name
-        ], capture_output=True, text=True, check=True)
-        
+    if _satisfied(package_name):
+        logger.info(f"✅ {package_name} déjà installé")
+        return True
+    
+    logger.info(f"Installation de {package_name}...")
+    returncode = _pip(['install', package_name])
+    
+    if returncode == 0:
         logger.info(f"✅ {package_name} installé avec succès")
         return True
-        
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Erreur lors de l'installation de {package_name}: {e.stderr}")
-        return False
+    
+    logger.error(f"❌ Erreur lors de l'installation de {package_name}: pip a retourné le code {returncode}")
+    return False
 
 def main():
     """Installe toutes les dépendances nécessaires pour Searx"""
@@ -3,88 +3,118 @@
 Installation des dépendances pour le système de capture visuelle Searx
 """
 
-import subprocess
+import functools
 import sys
 import logging
 import os
 import platform
-import requests
-import zipfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Cache webdriver-manager partagé avec install_interactive_navigation.py
+os.environ.setdefault('WDM_LOCAL', '1')
+os.environ.setdefault('WDM_SSL_VERIFY', '1')
+
+import _install_utils as deps
+from _install_utils import run_pip as _pip, satisfied as _satisfied
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('searx_visual_deps_installer')
 
+# Plateforme déterminée une seule fois à l'import
+_IS_WINDOWS = platform.system() == "Windows"
+
 def install_package(package_name):
     """Installe un package Python avec pip"""
-    try:
-        logger.info(f"Installation de {package_name}...")
-        result = subprocess.run([
-            sys.executable, '-m', 'pip', 'install', package_name
-        ], capture_output=True, text=True, check=True)
-        
+    if _satisfied(package_name):
+        logger.info(f"✅ {package_name} déjà installé")
+        return True
+    
+    logger.info(f"Installation de {package_name}...")
+    returncode = _pip(['install', package_name])
+    
+    if returncode == 0:
         logger.info(f"✅ {package_name} installé avec succès")
         return True
-        
-    except subprocess.CalledProcessError as e:
-        logger.error(f"❌ Erreur lors de l'installation de {package_name}: {e.stderr}")
-        return False
+    
+    logger.error(f"❌ Erreur lors de l'installation de {package_name}: pip a retourné le code {returncode}")
+    return False
 
+@functools.lru_cache(maxsize=None)
 def check_chrome_installed():
-    """Vérifie si Chrome est installé"""
+    """Vérifie si Chrome est installé (résultat mémorisé)"""
     try:
-        if platform.system() == "Windows":
-            chrome_paths = [
-                r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
-            ]
-            return any(os.path.exists(path) for path in chrome_paths)
+        if _IS_WINDOWS:
+            for path in (r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+                         r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"):
+                if os.path.isfile(path):
+                    return True
+            return False
         else:
-            result = subprocess.run(['which', 'google-chrome'], capture_output=True, text=True)
-            return result.returncode == 0
+            return shutil.which('google-chrome') is not None
     except:
         return False
 
+@functools.lru_cache(maxsize=None)
 def check_edge_installed():
-    """Vérifie si Edge est installé"""
+    """Vérifie si Edge est installé (résultat mémorisé)"""
     try:
-        if platform.system() == "Windows":
-            edge_paths = [
-                r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
-                r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"
-            ]
-            return any(os.path.exists(path) for path in edge_paths)
+        if _IS_WINDOWS:
+            for path in (r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe",
+                         r"C:\Program Files\Microsoft\Edge\Application\msedge.exe"):
+                if os.path.isfile(path):
+                    return True
+            return False
         else:
-            result = subprocess.run(['which', 'microsoft-edge'], capture_output=True, text=True)
-            return result.returncode == 0
+            return shutil.which('microsoft-edge') is not None
     except:
         return False
 
 def download_chromedriver():
-    """Télécharge ChromeDriver automatiquement"""
+    """Prépare ChromeDriver : le téléchargement est délégué à webdriver-manager"""
+    logger.info("Utilisation de webdriver-manager pour l'installation automatique")
+    return check_chrome_installed()
+
+def _probe_driver(kind):
+    """Lance puis ferme un navigateur headless, retourne (type, succès, erreur)"""
     try:
-        logger.info("Téléchargement de ChromeDriver...")
-        
-        # Déterminer la version de Chrome
-        if platform.system() == "Windows":
-            chrome_path = None
-            for path in [r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-                        r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"]:
-                if os.path.exists(path):
-                    chrome_path = path
-                    break
+        if kind == 'chrome':
+            options = deps.ChromeOptions()
+            options.add_argument('--headless')
+            options.add_argument('--no-sandbox')
+            options.add_argument('--disable-dev-shm-usage')
             
-            if not chrome_path:
-                logger.warning("Chrome non trouvé pour déterminer la version")
-                return False
-        
-        # Utiliser webdriver-manager pour une installation automatique
-        logger.info("Utilisation de webdriver-manager pour l'installation automatique")
-        return True
+            cached_path = deps.cached_chromedriver()
+            try:
+                driver = deps.webdriver.Chrome(
+                    service=deps.webdriver.chrome.service.Service(cached_path or deps.ChromeDriverManager().install()),
+                    options=options
+                )
+            except Exception:
+                if cached_path is None:
+                    raise
+                # Binaire en cache obsolète (Chrome mis à jour) : réinstallation
+                driver = deps.webdriver.Chrome(
+                    service=deps.webdriver.chrome.service.Service(deps.ChromeDriverManager().install()),
+                    options=options
+                )
+        else:
+            options = deps.EdgeOptions()
+            options.add_argument('--headless')
+            
+            driver = deps.webdriver.Edge(
+                service=deps.webdriver.edge.service.Service(deps.EdgeChromiumDriverManager().install()),
+                options=options
+            )
         
+        try:
+            driver.get("about:blank")
+        finally:
+            driver.quit()
+        return kind, True, None
+    
     except Exception as e:
-        logger.error(f"Erreur téléchargement ChromeDriver: {e}")
-        return False
+        return kind, False, e
 
 def main():
     """Installe toutes les dépendances nécessaires pour la capture visuelle"""
@@ -131,17 +161,16 @@ def main():
     # Test d'importation
     logger.info("🧪 Test des imports...")
     
+    if not deps.SELENIUM_OK and not deps.import_selenium():
+        logger.error(f"❌ Erreur d'import: {deps.SELENIUM_IMPORT_ERROR}")
+        return False
+    logger.info("✅ Selenium importé avec succès")
+    logger.info("✅ WebDriver Manager importé avec succès")
+    
     try:
-        import selenium
-        from selenium import webdriver
-        logger.info("✅ Selenium importé avec succès")
-        
         import PIL
         logger.info("✅ Pillow importé avec succès")
         
-        from webdriver_manager.chrome import ChromeDriverManager
-        logger.info("✅ WebDriver Manager importé avec succès")
-        
     except ImportError as e:
         logger.error(f"❌ Erreur d'import: {e}")
         return False
@@ -149,48 +178,21 @@ def main():
     # Test rapide WebDriver
     logger.info("🔧 Test rapide du WebDriver...")
     
-    try:
-        from selenium.webdriver.chrome.options import Options as ChromeOptions
-        from webdriver_manager.chrome import ChromeDriverManager
-        
-        if chrome_available:
-            options = ChromeOptions()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            
-            driver = webdriver.Chrome(
-                service=webdriver.chrome.service.Service(ChromeDriverManager().install()),
-                options=options
-            )
-            driver.get("about:blank")
-            driver.quit()
-            logger.info("✅ Test WebDriver Chrome réussi")
-            
-    except Exception as e:
-        logger.warning(f"⚠️ Test WebDriver Chrome échoué: {e}")
-        
-        # Essayer Edge comme alternative
-        try:
-            from selenium.webdriver.edge.options import Options as EdgeOptions
-            from webdriver_manager.microsoft import EdgeChromiumDriverManager
-            
-            if edge_available:
-                options = EdgeOptions()
-                options.add_argument('--headless')
-                
-                driver = webdriver.Edge(
-                    service=webdriver.edge.service.Service(EdgeChromiumDriverManager().install()),
-                    options=options
-                )
-                driver.get("about:blank")
-                driver.quit()
-                logger.info("✅ Test WebDriver Edge réussi")
-                
-        except Exception as e2:
-            logger.error(f"❌ Test WebDriver Edge aussi échoué: {e2}")
-            logger.error("La capture visuelle pourrait ne pas fonctionner")
-            return False
+    # Chrome et Edge sont testés en parallèle : durée = max(chrome, edge)
+    kinds = [kind for kind, available in (('chrome', chrome_available), ('edge', edge_available)) if available]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(_probe_driver, kinds))
+    
+    for kind, ok, error in results:
+        if ok:
+            logger.info(f"✅ Test WebDriver {kind.capitalize()} réussi")
+        else:
+            logger.warning(f"⚠️ Test WebDriver {kind.capitalize()} échoué: {error}")
+    
+    if not any(ok for _, ok, _ in results):
+        logger.error("❌ Aucun WebDriver n'a pu être lancé")
+        logger.error("La capture visuelle pourrait ne pas fonctionner")
+        return False
     
     logger.info("🎉 Installation terminée avec succès !")
     logger.info("Le système de capture visuelle Searx est prêt à l'emploi")
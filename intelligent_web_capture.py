@@ -5,22 +5,160 @@ Intégré avec Gemini Vision pour l'analyse en temps réel
 
 import os
 import time
+import base64
+import io
+import shutil
 import logging
 import json
+import queue
+import threading
 import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from pathlib import Path
-import requests
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance
+from concurrent.futures import ProcessPoolExecutor
 
 # Configuration du logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('IntelligentWebCapture')
 
+# Bibliothèques d'image chargées à la première image traitée (voir _load_imaging)
+Image = ImageEnhance = None
+_WEBP_SUPPORTED = False
+
+# Réglages d'amélioration pour l'IA
+_CONTRAST_FACTOR = 1.2
+_SHARPNESS_FACTOR = 1.1
+_MAX_IMAGE_SIZE = (1920, 1080)  # Taille maximale des images envoyées à Gemini
+
+def _load_imaging():
+    """
+    Importe PIL à la première utilisation
+    
+    Un service qui importe ce module sans traiter d'image ne paie ni l'import
+    ni l'enregistrement des plugins PIL. Les appels suivants sont immédiats.
+    """
+    global Image, ImageEnhance, _WEBP_SUPPORTED
+    if Image is not None:
+        return
+    
+    from PIL import Image, ImageEnhance
+    
+    # WebP donne des fichiers 25-50% plus légers que JPEG à qualité égale
+    _WEBP_SUPPORTED = 'WEBP' in Image.registered_extensions().values()
+
+def _file_digest(path: Path) -> str:
+    """Empreinte blake2b d'un fichier, calculée par blocs sans charger tout le contenu"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'blake2b').hexdigest()
+        
+        digest = hashlib.blake2b()
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+def _optimize_image(raw_path: str, out_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Pipeline PIL d'optimisation d'une capture (contraste, netteté, redimensionnement, encodage)
+    
+    Fonction de module pour pouvoir être exécutée dans un ProcessPoolExecutor.
+    
+    Returns:
+        Chemin, nom et métadonnées de l'image optimisée, ou None en cas d'erreur
+    """
+    try:
+        _load_imaging()
+        raw_path = Path(raw_path)
+        out_dir = Path(out_dir)
+        
+        max_size = _MAX_IMAGE_SIZE
+        
+        # Ouvrir l'image
+        with Image.open(raw_path) as img:
+            # JPEG : décodage directement à l'échelle 1/2, 1/4 ou 1/8 la plus proche de la cible
+            if raw_path.suffix.lower() in ('.jpg', '.jpeg'):
+                img.draft('RGB', max_size)
+            
+            # Convertir en RGB si nécessaire
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            
+            # Améliorer la qualité pour l'IA
+            # 1. Améliorer le contraste
+            enhancer = ImageEnhance.Contrast(img)
+            img = enhancer.enhance(_CONTRAST_FACTOR)
+            
+            # 2. Améliorer la netteté
+            enhancer = ImageEnhance.Sharpness(img)
+            img = enhancer.enhance(_SHARPNESS_FACTOR)
+            
+            # 3. Redimensionner si trop grande (optimisation pour Gemini)
+            if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
+                img.thumbnail(max_size, Image.Resampling.LANCZOS)
+            
+            # Sauvegarder la version optimisée
+            if _WEBP_SUPPORTED:
+                optimized_filename = f"opt_{raw_path.stem}.webp"
+                optimized_path = out_dir / optimized_filename
+                img.save(optimized_path, 'WEBP', quality=85, method=6)
+            else:
+                optimized_filename = f"opt_{raw_path.stem}.jpg"
+                optimized_path = out_dir / optimized_filename
+                img.save(optimized_path, 'JPEG', quality=90, optimize=True)
+            
+            # Calculer les métadonnées
+            file_size_raw = raw_path.stat().st_size
+            file_size_optimized = optimized_path.stat().st_size
+            compression_ratio = file_size_raw / file_size_optimized if file_size_optimized > 0 else 1
+            
+            return {
+                'optimized_path': str(optimized_path),
+                'optimized_filename': optimized_filename,
+                'optimization': {
+                    'file_size_raw': file_size_raw,
+                    'file_size_optimized': file_size_optimized,
+                    'compression_ratio': round(compression_ratio, 2),
+                    'image_size': img.size,
+                    'enhancements': ['contrast', 'sharpness', 'resize']
+                }
+            }
+            
+    except Exception as e:
+        logger.error(f"❌ Erreur optimisation image: {e}")
+        return None
+
 class IntelligentWebCapture:
     """Système de capture visuelle intelligent pour sites web"""
     
+    # Viewport -> clé de capture_config contenant sa taille (modifiable par instance)
+    _VIEWPORT_SIZE_KEYS = {
+        'desktop': 'window_size',
+        'mobile': 'mobile_size',
+        'tablet': 'tablet_size'
+    }
+    _FILENAME_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+    
+    # Comptage des éléments, titre, URL et taille de fenêtre en un seul execute_script
+    _ELEMENTS_ANALYSIS_JS = """return {
+        buttons: document.querySelectorAll('button, .btn, input[type="submit"], input[type="button"]').length,
+        links: document.querySelectorAll('a[href]').length,
+        forms: document.querySelectorAll('form').length,
+        inputs: document.querySelectorAll('input, textarea, select').length,
+        images: document.querySelectorAll('img').length,
+        headings: document.querySelectorAll('h1, h2, h3, h4, h5, h6').length,
+        title: document.title,
+        url: location.href,
+        viewport: {width: window.outerWidth, height: window.outerHeight}
+    };"""
+    
+    # Conditions d'attente évaluées côté navigateur
+    _PAGE_LOADED_JS = "return document.readyState === 'complete';"
+    _FONTS_READY_JS = "return !document.fonts || document.fonts.status === 'loaded';"
+    _SCROLL_SETTLED_JS = """return (Math.abs(window.scrollY - arguments[0]) < 1
+        || window.scrollY + window.innerHeight >= document.documentElement.scrollHeight)
+        && (!document.fonts || document.fonts.status === 'loaded');"""
+    
     def __init__(self, screenshots_dir: str = "intelligent_screenshots"):
         """
         Initialise le système de capture intelligent
@@ -41,17 +179,40 @@ class IntelligentWebCapture:
         
         self.webdriver = None
         self.driver_initialized = False
+        self._current_window_size: Optional[Tuple[int, int]] = None  # Dernière taille appliquée
         
         # Configuration de capture
         self.capture_config = {
             'window_size': (1920, 1080),
             'mobile_size': (375, 667),
             'tablet_size': (768, 1024),
-            'wait_time': 3,  # Temps d'attente pour le chargement
-            'scroll_pause': 1,  # Pause entre les scrolls
-            'element_highlight': True  # Surligner les éléments importants
+            'wait_time': 10,  # Attente maximale du chargement (document.readyState)
+            'scroll_pause': 1,  # Attente maximale de la fin d'un scroll
+            'settle_time': 0.1,  # Pause de stabilisation du rendu après chaque attente
+            'native_webp_quality': 85,  # Qualité WebP encodée directement par Chrome (CDP)
+            'enhance_native_captures': False,  # Contraste/netteté PIL aussi sur les captures WebP natives (toujours bornées à _MAX_IMAGE_SIZE)
+            'capture_cache_ttl': 3600,  # Durée de réutilisation d'une capture de la même URL (secondes)
+            'optimization_cache_ttl': 7 * 24 * 3600,  # Durée de conservation d'une optimisation en cache (secondes)
+            'optimization_cache_size': 1000,  # Nombre maximal d'optimisations en cache
+            'blocked_url_patterns': [  # Ressources inutiles à la capture, bloquées au niveau réseau
+                '*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm',
+                '*doubleclick.net/*', '*google-analytics.com/*', '*googletagmanager.com/*'
+            ],
+            'block_stylesheets': False  # Bloquer aussi les CSS (captures purement structurelles)
         }
         
+        # Cache empreinte de la capture brute -> optimisation déjà calculée
+        self._opt_cache_path = self.analysis_cache_dir / "optimization_cache.json"
+        self._opt_cache = self._load_opt_cache()
+        self._opt_cache_dirty = False  # Écrit une fois par lot de captures (voir _flush_opt_cache)
+        
+        # Manifeste URL/viewport/type -> dernier résultat de capture
+        self._manifest_path = self.analysis_cache_dir / "manifest.json"
+        self._manifest = self._load_manifest()
+        
+        # Pool de processus pour le pipeline PIL (créé à la première utilisation)
+        self._optimization_pool: Optional[ProcessPoolExecutor] = None
+        
         # Statistiques
         self.stats = {
             'captures_taken': 0,
@@ -104,6 +265,8 @@ class IntelligentWebCapture:
             # Créer le driver
             self.webdriver = webdriver.Chrome(options=chrome_options)
             self.webdriver.set_page_load_timeout(30)
+            self._current_window_size = tuple(self.capture_config['window_size'])  # --window-size
+            self._block_unneeded_resources()
             
             # Importer les modules Selenium pour utilisation
             self.By = By
@@ -119,6 +282,62 @@ class IntelligentWebCapture:
             logger.error(f"❌ Erreur initialisation WebDriver: {e}")
             return False
     
+    def _block_unneeded_resources(self):
+        """Bloque polices, vidéos et traceurs via CDP pour accélérer le chargement"""
+        patterns = list(self.capture_config['blocked_url_patterns'])
+        if self.capture_config['block_stylesheets']:
+            patterns.append('*.css')
+        
+        try:
+            self.webdriver.execute_cdp_cmd('Network.enable', {})
+            self.webdriver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+            logger.info(f"🚫 {len(patterns)} motifs de ressources bloqués")
+        except Exception as e:
+            logger.debug(f"Blocage réseau CDP indisponible: {e}")
+    
+    def _wait_for(self, script: str, timeout: float, *args) -> bool:
+        """
+        Attend qu'un script JavaScript retourne vrai, puis laisse le rendu se stabiliser
+        
+        Returns:
+            True si la condition est atteinte avant le délai, False sinon (la capture continue)
+        """
+        try:
+            self.WebDriverWait(self.webdriver, timeout, poll_frequency=0.05).until(
+                lambda driver: driver.execute_script(script, *args)
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"⏱️ Condition non atteinte après {timeout}s: {e.__class__.__name__}")
+            return False
+        finally:
+            time.sleep(self.capture_config['settle_time'])
+    
+    def _save_screenshot(self, raw_path: Path) -> Path:
+        """
+        Enregistre une capture, encodée en WebP directement par Chrome via CDP
+        
+        Args:
+            raw_path: Chemin souhaité (l'extension est adaptée au format obtenu)
+            
+        Returns:
+            Chemin réel du fichier écrit
+        """
+        try:
+            result = self.webdriver.execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'webp',
+                'quality': self.capture_config['native_webp_quality']
+            })
+            webp_path = raw_path.with_suffix('.webp')
+            webp_path.write_bytes(base64.b64decode(result['data']))
+            return webp_path
+        except Exception as e:
+            # Navigateur sans CDP : capture PNG classique, optimisée ensuite par PIL
+            logger.debug(f"Capture CDP indisponible, repli PNG: {e}")
+            png_path = raw_path.with_suffix('.png')
+            self.webdriver.save_screenshot(str(png_path))
+            return png_path
+    
     def capture_website_intelligent(self, 
                                   url: str, 
                                   capture_type: str = "full_page",
@@ -138,6 +357,14 @@ class IntelligentWebCapture:
         """
         start_time = datetime.now()
         
+        # Capture récente de la même page : aucun accès au navigateur
+        cache_key = hashlib.blake2b(f"{url}|{viewport}|{capture_type}|{analyze_elements}".encode(),
+                                  digest_size=16).hexdigest()
+        cached_result = self._get_cached_capture(cache_key)
+        if cached_result is not None:
+            logger.info(f"♻️ Capture récente réutilisée pour {url}")
+            return cached_result
+        
         try:
             if not self.driver_initialized and not self._initialize_webdriver():
                 return {
@@ -147,49 +374,57 @@ class IntelligentWebCapture:
                 }
             
             # Configuration du viewport
-            viewport_sizes = {
-                'desktop': self.capture_config['window_size'],
-                'mobile': self.capture_config['mobile_size'], 
-                'tablet': self.capture_config['tablet_size']
-            }
-            
-            if viewport in viewport_sizes:
-                size = viewport_sizes[viewport]
-                self.webdriver.set_window_size(size[0], size[1])
-                logger.info(f"📱 Viewport configuré: {viewport} ({size[0]}x{size[1]})")
+            size_key = self._VIEWPORT_SIZE_KEYS.get(viewport)
+            if size_key:
+                size = tuple(self.capture_config[size_key])
+                # Redimensionner provoque un relayout complet : seulement si la taille change
+                if size != self._current_window_size:
+                    self.webdriver.set_window_size(size[0], size[1])
+                    self._current_window_size = size
+                    logger.info(f"📱 Viewport configuré: {viewport} ({size[0]}x{size[1]})")
             
             # Naviguer vers l'URL
             logger.info(f"🌐 Navigation vers: {url}")
             self.webdriver.get(url)
             
             # Attendre le chargement
-            time.sleep(self.capture_config['wait_time'])
+            self._wait_for(self._PAGE_LOADED_JS, self.capture_config['wait_time'])
             
             # Générer nom de fichier unique
-            url_hash = hashlib.md5(url.encode()).hexdigest()[:8]
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            url_hash = hashlib.blake2b(url.encode(), digest_size=4).hexdigest()
+            timestamp = start_time.strftime(self._FILENAME_TIMESTAMP_FORMAT)
             base_filename = f"capture_{viewport}_{url_hash}_{timestamp}"
             
             captures = []
             
-            if capture_type == "full_page":
-                # Capture de la page complète avec scrolling intelligent
-                captures.extend(self._capture_full_page_intelligent(base_filename, analyze_elements))
-                
-            elif capture_type == "visible_area":
-                # Capture de la zone visible uniquement
-                captures.extend(self._capture_visible_area(base_filename, analyze_elements))
-                
-            elif capture_type == "element_focused":
-                # Capture focalisée sur les éléments importants
-                captures.extend(self._capture_important_elements(base_filename))
+            # Les captures sont optimisées au fil de l'eau pendant que le navigateur scrolle
+            captures_queue: queue.Queue = queue.Queue()
+            pending_optimizations: List[Tuple[Dict[str, Any], Optional[str], Any]] = []
+            consumer = threading.Thread(
+                target=self._optimization_consumer,
+                args=(captures_queue, pending_optimizations),
+                daemon=True
+            )
+            consumer.start()
+            
+            try:
+                if capture_type == "full_page":
+                    # Capture de la page complète avec scrolling intelligent
+                    captures.extend(self._capture_full_page_intelligent(base_filename, analyze_elements, captures_queue))
+                    
+                elif capture_type == "visible_area":
+                    # Capture de la zone visible uniquement
+                    captures.extend(self._capture_visible_area(base_filename, analyze_elements, captures_queue))
+                    
+                elif capture_type == "element_focused":
+                    # Capture focalisée sur les éléments importants
+                    captures.extend(self._capture_important_elements(base_filename, captures_queue))
+            finally:
+                captures_queue.put(None)
+                consumer.join()
             
-            # Optimiser toutes les captures pour l'IA
-            optimized_captures = []
-            for capture in captures:
-                optimized = self._optimize_for_ai_analysis(capture)
-                if optimized:
-                    optimized_captures.append(optimized)
+            # Récupérer les optimisations pour l'IA
+            optimized_captures = self._collect_optimizations(pending_optimizations)
             
             # Calculer le temps de traitement
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -201,7 +436,7 @@ class IntelligentWebCapture:
             
             logger.info(f"✅ Capture intelligente réussie: {len(optimized_captures)} images en {processing_time:.2f}s")
             
-            return {
+            result = {
                 'success': True,
                 'url': url,
                 'capture_type': capture_type,
@@ -212,6 +447,11 @@ class IntelligentWebCapture:
                 'total_captures': len(optimized_captures)
             }
             
+            if optimized_captures:
+                self._store_cached_capture(cache_key, result)
+            
+            return result
+            
         except Exception as e:
             self.stats['failed_captures'] += 1
             error_msg = f"Erreur capture intelligente {url}: {str(e)}"
@@ -223,8 +463,13 @@ class IntelligentWebCapture:
                 'captures': []
             }
     
-    def _capture_full_page_intelligent(self, base_filename: str, analyze_elements: bool) -> List[Dict[str, Any]]:
-        """Capture intelligente de la page complète avec scrolling adaptatif"""
+    def _capture_full_page_intelligent(self, base_filename: str, analyze_elements: bool,
+                                       captures_queue: Optional[queue.Queue] = None) -> List[Dict[str, Any]]:
+        """Capture intelligente de la page complète (capture CDP unique, sinon scrolling adaptatif)"""
+        captures = self._capture_full_page_single_shot(base_filename, analyze_elements, captures_queue)
+        if captures is not None:
+            return captures
+        
         captures = []
         
         try:
@@ -234,44 +479,37 @@ class IntelligentWebCapture:
             
             logger.info(f"📏 Page: {total_height}px, Viewport: {viewport_height}px")
             
-            # Calculer le nombre de captures nécessaires
-            scroll_positions = []
-            current_position = 0
-            
-            while current_position < total_height:
-                scroll_positions.append(current_position)
-                current_position += viewport_height * 0.8  # 20% de chevauchement
-            
-            # S'assurer de capturer le bas de la page
-            if scroll_positions[-1] < total_height - viewport_height:
-                scroll_positions.append(total_height - viewport_height)
+            scroll_positions = self._section_positions(total_height, viewport_height)
             
             # Prendre les captures à chaque position
             for i, position in enumerate(scroll_positions):
                 # Scroller à la position
                 self.webdriver.execute_script(f"window.scrollTo(0, {position});")
-                time.sleep(self.capture_config['scroll_pause'])
+                self._wait_for(self._SCROLL_SETTLED_JS, self.capture_config['scroll_pause'], position)
                 
                 # Nom de fichier pour cette section
                 section_filename = f"{base_filename}_section_{i+1:02d}.png"
                 raw_path = self.raw_screenshots_dir / section_filename
                 
                 # Prendre la capture
-                self.webdriver.save_screenshot(str(raw_path))
+                raw_path = self._save_screenshot(raw_path)
                 
                 # Analyser les éléments si demandé
                 elements_info = {}
                 if analyze_elements:
                     elements_info = self._analyze_visible_elements()
                 
-                captures.append({
+                capture = {
                     'section': i + 1,
                     'total_sections': len(scroll_positions),
                     'raw_path': str(raw_path),
                     'scroll_position': position,
                     'elements_info': elements_info,
-                    'filename': section_filename
-                })
+                    'filename': raw_path.name
+                }
+                captures.append(capture)
+                if captures_queue is not None:
+                    captures_queue.put(capture)
                 
                 logger.info(f"📸 Section {i+1}/{len(scroll_positions)} capturée")
             
@@ -284,34 +522,125 @@ class IntelligentWebCapture:
             logger.error(f"❌ Erreur capture page complète: {e}")
             return []
     
-    def _capture_visible_area(self, base_filename: str, analyze_elements: bool) -> List[Dict[str, Any]]:
+    def _capture_full_page_single_shot(self, base_filename: str, analyze_elements: bool,
+                                       captures_queue: Optional[queue.Queue] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rend toute la page en une seule capture CDP (captureBeyondViewport) puis la découpe en sections
+        
+        Les sections conservent le découpage du mode avec scrolling (20% de chevauchement),
+        sans scroll ni attente entre elles.
+        
+        Returns:
+            Liste des captures, ou None si CDP est indisponible (repli sur le scrolling)
+        """
+        try:
+            metrics = self.webdriver.execute_cdp_cmd('Page.getLayoutMetrics', {})
+            content = metrics.get('cssContentSize') or metrics['contentSize']
+            viewport = metrics.get('cssLayoutViewport') or metrics['layoutViewport']
+            total_width, total_height = content['width'], content['height']
+            viewport_height = viewport['clientHeight']
+            
+            result = self.webdriver.execute_cdp_cmd('Page.captureScreenshot', {
+                'format': 'png',
+                'captureBeyondViewport': True,
+                'clip': {'x': 0, 'y': 0, 'width': total_width, 'height': total_height, 'scale': 1}
+            })
+        except Exception as e:
+            logger.debug(f"Capture pleine page CDP indisponible, repli sur le scrolling: {e}")
+            return None
+        
+        try:
+            logger.info(f"📏 Page: {total_height}px, Viewport: {viewport_height}px (capture unique)")
+            
+            scroll_positions = self._section_positions(total_height, viewport_height)
+            
+            # Les éléments ne changent pas entre les sections : une seule analyse
+            elements_info = self._analyze_visible_elements() if analyze_elements else {}
+            
+            captures = []
+            _load_imaging()
+            with Image.open(io.BytesIO(base64.b64decode(result['data']))) as page:
+                scale = page.height / total_height if total_height else 1
+                max_scroll = max(total_height - viewport_height, 0)
+                for i, position in enumerate(scroll_positions):
+                    # Même cadrage qu'un scroll réel, que le navigateur borne en bas de page
+                    top_css = min(position, max_scroll)
+                    top = int(top_css * scale)
+                    bottom = min(int((top_css + viewport_height) * scale), page.height)
+                    
+                    raw_path = self.raw_screenshots_dir / f"{base_filename}_section_{i+1:02d}.png"
+                    # PNG sans compression poussée : l'encodage final est fait par l'optimisation
+                    page.crop((0, top, page.width, bottom)).save(raw_path, 'PNG', compress_level=1)
+                    
+                    capture = {
+                        'section': i + 1,
+                        'total_sections': len(scroll_positions),
+                        'raw_path': str(raw_path),
+                        'scroll_position': position,
+                        'elements_info': elements_info,
+                        'filename': raw_path.name
+                    }
+                    captures.append(capture)
+                    if captures_queue is not None:
+                        captures_queue.put(capture)
+            
+            logger.info(f"📸 {len(captures)} sections découpées depuis une capture unique")
+            return captures
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur capture page complète: {e}")
+            return []
+    
+    @staticmethod
+    def _section_positions(total_height: float, viewport_height: float) -> List[float]:
+        """Positions de début des sections, avec 20% de chevauchement"""
+        scroll_positions = []
+        current_position = 0
+        
+        while current_position < total_height:
+            scroll_positions.append(current_position)
+            current_position += viewport_height * 0.8  # 20% de chevauchement
+        
+        # S'assurer de capturer le bas de la page
+        if scroll_positions and scroll_positions[-1] < total_height - viewport_height:
+            scroll_positions.append(total_height - viewport_height)
+        
+        return scroll_positions
+    
+    def _capture_visible_area(self, base_filename: str, analyze_elements: bool,
+                              captures_queue: Optional[queue.Queue] = None) -> List[Dict[str, Any]]:
         """Capture de la zone visible actuelle"""
         try:
             filename = f"{base_filename}_visible.png"
             raw_path = self.raw_screenshots_dir / filename
             
             # Prendre la capture
-            self.webdriver.save_screenshot(str(raw_path))
+            raw_path = self._save_screenshot(raw_path)
             
             # Analyser les éléments
             elements_info = {}
             if analyze_elements:
                 elements_info = self._analyze_visible_elements()
             
-            return [{
+            capture = {
                 'section': 1,
                 'total_sections': 1,
                 'raw_path': str(raw_path),
                 'scroll_position': 0,
                 'elements_info': elements_info,
-                'filename': filename
-            }]
+                'filename': raw_path.name
+            }
+            if captures_queue is not None:
+                captures_queue.put(capture)
+            
+            return [capture]
             
         except Exception as e:
             logger.error(f"❌ Erreur capture zone visible: {e}")
             return []
     
-    def _capture_important_elements(self, base_filename: str) -> List[Dict[str, Any]]:
+    def _capture_important_elements(self, base_filename: str,
+                                    captures_queue: Optional[queue.Queue] = None) -> List[Dict[str, Any]]:
         """Capture focalisée sur les éléments importants (headers, forms, CTA, etc.)"""
         captures = []
         
@@ -333,22 +662,25 @@ class IntelligentWebCapture:
                     if elements:
                         # Scroller vers le premier élément trouvé
                         self.webdriver.execute_script("arguments[0].scrollIntoView({block: 'center'});", elements[0])
-                        time.sleep(1)
+                        self._wait_for(self._FONTS_READY_JS, self.capture_config['scroll_pause'])
                         
                         # Prendre la capture
                         filename = f"{base_filename}_element_{i+1:02d}.png"
                         raw_path = self.raw_screenshots_dir / filename
                         
-                        self.webdriver.save_screenshot(str(raw_path))
+                        raw_path = self._save_screenshot(raw_path)
                         
-                        captures.append({
+                        capture = {
                             'section': i + 1,
                             'total_sections': len(important_selectors),
                             'raw_path': str(raw_path),
                             'element_type': selector,
                             'elements_found': len(elements),
-                            'filename': filename
-                        })
+                            'filename': raw_path.name
+                        }
+                        captures.append(capture)
+                        if captures_queue is not None:
+                            captures_queue.put(capture)
                         
                         logger.info(f"🎯 Élément capturé: {selector} ({len(elements)} trouvés)")
                 
@@ -365,27 +697,19 @@ class IntelligentWebCapture:
     def _analyze_visible_elements(self) -> Dict[str, Any]:
         """Analyse les éléments visibles sur la page actuelle"""
         try:
-            # Compter différents types d'éléments
+            # Un seul aller-retour vers le driver au lieu d'un find_elements par type
+            data = self.webdriver.execute_script(self._ELEMENTS_ANALYSIS_JS)
+            
             elements_count = {
-                'buttons': len(self.webdriver.find_elements(self.By.CSS_SELECTOR, 'button, .btn, input[type="submit"], input[type="button"]')),
-                'links': len(self.webdriver.find_elements(self.By.CSS_SELECTOR, 'a[href]')),
-                'forms': len(self.webdriver.find_elements(self.By.CSS_SELECTOR, 'form')),
-                'inputs': len(self.webdriver.find_elements(self.By.CSS_SELECTOR, 'input, textarea, select')),
-                'images': len(self.webdriver.find_elements(self.By.CSS_SELECTOR, 'img')),
-                'headings': len(self.webdriver.find_elements(self.By.CSS_SELECTOR, 'h1, h2, h3, h4, h5, h6'))
+                key: data[key]
+                for key in ('buttons', 'links', 'forms', 'inputs', 'images', 'headings')
             }
             
-            # Obtenir le titre de la page
-            page_title = self.webdriver.title
-            
-            # Obtenir l'URL actuelle
-            current_url = self.webdriver.current_url
-            
             return {
-                'page_title': page_title,
-                'current_url': current_url,
+                'page_title': data['title'],
+                'current_url': data['url'],
                 'elements_count': elements_count,
-                'viewport_size': self.webdriver.get_window_size(),
+                'viewport_size': data['viewport'],
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -395,69 +719,260 @@ class IntelligentWebCapture:
     
     def _optimize_for_ai_analysis(self, capture_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Optimise une capture pour l'analyse par l'IA"""
+        shortcut, digest = self._try_optimization_shortcuts(capture_info)
+        if digest is None:
+            return shortcut
+        
+        result = _optimize_image(capture_info['raw_path'], str(self.optimized_screenshots_dir))
+        optimized_info = self._finish_optimization(capture_info, digest, result)
+        self._flush_opt_cache()
+        return optimized_info
+    
+    def _optimization_consumer(self, captures_queue: queue.Queue,
+                               results: List[Tuple[Dict[str, Any], Optional[str], Any]]):
+        """
+        Consomme les captures au fur et à mesure de leur production (thread dédié)
+        
+        Les raccourcis (WebP natif, cache) sont résolus immédiatement ; le travail PIL
+        est soumis au pool de processus. Le producteur termine la file avec None.
+        """
+        out_dir = str(self.optimized_screenshots_dir)
+        while True:
+            capture = captures_queue.get()
+            if capture is None:
+                break
+            
+            shortcut, digest = self._try_optimization_shortcuts(capture)
+            if digest is None:
+                results.append((capture, None, shortcut))
+            else:
+                future = self._get_optimization_pool().submit(_optimize_image, capture['raw_path'], out_dir)
+                results.append((capture, digest, future))
+    
+    def _collect_optimizations(self, results: List[Tuple[Dict[str, Any], Optional[str], Any]]) -> List[Dict[str, Any]]:
+        """Attend les optimisations soumises par le consommateur, dans l'ordre des captures"""
+        optimized_captures = []
+        for capture, digest, outcome in results:
+            if digest is not None:
+                outcome = self._finish_optimization(capture, digest, outcome.result())
+            if outcome:
+                optimized_captures.append(outcome)
+        self._flush_opt_cache()
+        return optimized_captures
+    
+    def _get_optimization_pool(self) -> ProcessPoolExecutor:
+        """Retourne le pool de processus d'optimisation, créé à la première utilisation"""
+        if self._optimization_pool is None:
+            self._optimization_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return self._optimization_pool
+    
+    def _try_optimization_shortcuts(self, capture_info: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Traite les cas qui ne nécessitent pas PIL
+        
+        Returns:
+            (résultat, None) si la capture est traitée ou invalide,
+            (None, empreinte) si elle doit passer par le pipeline PIL
+        """
         try:
             raw_path = Path(capture_info['raw_path'])
             if not raw_path.exists():
-                return None
+                return None, None
+            
+            # Capture déjà encodée en WebP par Chrome : pas de décodage/ré-encodage PIL
+            if raw_path.suffix == '.webp' and not self.capture_config['enhance_native_captures']:
+                return self._register_native_capture(capture_info, raw_path), None
+            
+            # Capture identique déjà optimisée : réutiliser le résultat
+            digest = _file_digest(raw_path)
+            cached = self._opt_cache.get(digest)
+            if cached and Path(cached['optimized_path']).exists():
+                cached['cached_at'] = time.time()  # Entrée encore utile : conservée par la purge
+                self._opt_cache_dirty = True
+                return self._reuse_optimized_capture(capture_info, raw_path, cached), None
+            
+            return None, digest
             
-            # Ouvrir l'image
-            with Image.open(raw_path) as img:
-                # Convertir en RGB si nécessaire
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Améliorer la qualité pour l'IA
-                # 1. Améliorer le contraste
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(1.2)
-                
-                # 2. Améliorer la netteté
-                enhancer = ImageEnhance.Sharpness(img)
-                img = enhancer.enhance(1.1)
-                
-                # 3. Redimensionner si trop grande (optimisation pour Gemini)
-                max_size = (1920, 1080)
-                if img.size[0] > max_size[0] or img.size[1] > max_size[1]:
-                    img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Sauvegarder la version optimisée
-                optimized_filename = f"opt_{raw_path.stem}.jpg"
-                optimized_path = self.optimized_screenshots_dir / optimized_filename
-                
-                img.save(optimized_path, 'JPEG', quality=90, optimize=True)
-                
-                # Calculer les métadonnées
-                file_size_raw = raw_path.stat().st_size
-                file_size_optimized = optimized_path.stat().st_size
-                compression_ratio = file_size_raw / file_size_optimized if file_size_optimized > 0 else 1
-                
-                # Mise à jour des informations de capture
-                optimized_info = capture_info.copy()
-                optimized_info.update({
-                    'optimized_path': str(optimized_path),
-                    'optimized_filename': optimized_filename,
-                    'optimization': {
-                        'file_size_raw': file_size_raw,
-                        'file_size_optimized': file_size_optimized,
-                        'compression_ratio': round(compression_ratio, 2),
-                        'image_size': img.size,
-                        'enhancements': ['contrast', 'sharpness', 'resize']
-                    }
-                })
-                
-                logger.info(f"✨ Image optimisée: {compression_ratio:.1f}x compression")
-                return optimized_info
-                
         except Exception as e:
             logger.error(f"❌ Erreur optimisation image: {e}")
+            return None, None
+    
+    def _finish_optimization(self, capture_info: Dict[str, Any], digest: str,
+                             result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Fusionne le résultat PIL dans les informations de capture et alimente le cache"""
+        if result is None:
+            return None
+        
+        optimized_info = capture_info.copy()
+        optimized_info.update(result)
+        
+        self._opt_cache[digest] = {
+            'optimized_path': result['optimized_path'],
+            'optimization': result['optimization'],
+            'cached_at': time.time()
+        }
+        self._opt_cache_dirty = True
+        
+        logger.info(f"✨ Image optimisée: {result['optimization']['compression_ratio']:.1f}x compression")
+        return optimized_info
+    
+    def _register_native_capture(self, capture_info: Dict[str, Any], raw_path: Path) -> Dict[str, Any]:
+        """
+        Publie une capture WebP native dans le répertoire optimisé
+        
+        Sans ré-encodage si elle tient dans _MAX_IMAGE_SIZE (cas d'une capture
+        de la fenêtre) ; sinon elle est réduite comme dans _optimize_image.
+        """
+        optimized_filename = f"opt_{raw_path.name}"
+        optimized_path = self.optimized_screenshots_dir / optimized_filename
+        enhancements = ['native_webp']
+        
+        _load_imaging()
+        with Image.open(raw_path) as img:  # lecture de l'en-tête seulement
+            image_size = img.size
+            if image_size[0] > _MAX_IMAGE_SIZE[0] or image_size[1] > _MAX_IMAGE_SIZE[1]:
+                img.thumbnail(_MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+                image_size = img.size
+                enhancements.append('resize')
+                if optimized_path.exists():
+                    optimized_path.unlink()
+                img.save(optimized_path, 'WEBP', quality=self.capture_config['native_webp_quality'], method=6)
+        
+        if 'resize' not in enhancements:
+            self._link_or_copy(raw_path, optimized_path)
+        
+        file_size_raw = raw_path.stat().st_size
+        file_size_optimized = optimized_path.stat().st_size
+        
+        optimized_info = capture_info.copy()
+        optimized_info.update({
+            'optimized_path': str(optimized_path),
+            'optimized_filename': optimized_filename,
+            'optimization': {
+                'file_size_raw': file_size_raw,
+                'file_size_optimized': file_size_optimized,
+                'compression_ratio': round(file_size_raw / file_size_optimized, 2) if file_size_optimized > 0 else 1,
+                'image_size': image_size,
+                'enhancements': enhancements
+            }
+        })
+        
+        return optimized_info
+    
+    def _reuse_optimized_capture(self, capture_info: Dict[str, Any], raw_path: Path,
+                                 cached: Dict[str, Any]) -> Dict[str, Any]:
+        """Publie sous un nouveau nom une optimisation déjà calculée pour la même image"""
+        optimized_filename = f"opt_{raw_path.stem}{Path(cached['optimized_path']).suffix}"
+        optimized_path = self.optimized_screenshots_dir / optimized_filename
+        self._link_or_copy(Path(cached['optimized_path']), optimized_path)
+        
+        optimized_info = capture_info.copy()
+        optimized_info.update({
+            'optimized_path': str(optimized_path),
+            'optimized_filename': optimized_filename,
+            'optimization': cached['optimization']
+        })
+        
+        logger.info("♻️ Image déjà optimisée, résultat réutilisé")
+        return optimized_info
+    
+    @staticmethod
+    def _link_or_copy(source: Path, destination: Path):
+        """Crée un lien physique vers source, ou une copie si le système ne le permet pas"""
+        if destination == source:
+            return
+        if destination.exists():
+            destination.unlink()
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copyfile(source, destination)
+    
+    def _get_cached_capture(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Retourne le résultat mémorisé s'il est encore valide et que ses fichiers existent"""
+        entry = self._manifest.get(cache_key)
+        if not entry or time.time() - entry['cached_at'] > self.capture_config['capture_cache_ttl']:
             return None
+        
+        result = entry['result']
+        if not all(Path(capture['optimized_path']).exists() for capture in result['captures']):
+            return None
+        
+        return dict(result, from_cache=True)
+    
+    def _store_cached_capture(self, cache_key: str, result: Dict[str, Any]):
+        """Mémorise un résultat de capture et purge les entrées expirées"""
+        now = time.time()
+        ttl = self.capture_config['capture_cache_ttl']
+        self._manifest = {
+            key: entry for key, entry in self._manifest.items()
+            if now - entry['cached_at'] <= ttl
+        }
+        self._manifest[cache_key] = {'cached_at': now, 'result': result}
+        self._save_manifest()
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Charge le manifeste des captures récentes"""
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self):
+        """Sauvegarde le manifeste des captures récentes dans analysis_cache_dir"""
+        try:
+            with open(self._manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f)
+        except OSError as e:
+            logger.warning(f"⚠️ Manifeste des captures non sauvegardé: {e}")
+    
+    def _load_opt_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Charge le cache persistant des optimisations"""
+        try:
+            with open(self._opt_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _flush_opt_cache(self):
+        """Purge puis sauvegarde le cache des optimisations s'il a changé (une fois par lot de captures)"""
+        if not self._opt_cache_dirty:
+            return
+        
+        # Entrées expirées ou dont le fichier optimisé a disparu, puis les plus anciennes au-delà de la taille maximale
+        now = time.time()
+        ttl = self.capture_config['optimization_cache_ttl']
+        entries = sorted(
+            ((digest, entry) for digest, entry in self._opt_cache.items()
+             if now - entry.get('cached_at', 0) <= ttl and Path(entry['optimized_path']).exists()),
+            key=lambda item: item[1]['cached_at'],
+            reverse=True
+        )
+        self._opt_cache = dict(entries[:self.capture_config['optimization_cache_size']])
+        
+        self._save_opt_cache()
+        self._opt_cache_dirty = False
+    
+    def _save_opt_cache(self):
+        """Sauvegarde le cache des optimisations dans analysis_cache_dir"""
+        try:
+            with open(self._opt_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self._opt_cache, f)
+        except OSError as e:
+            logger.warning(f"⚠️ Cache d'optimisation non sauvegardé: {e}")
     
     def close(self):
-        """Ferme le WebDriver"""
+        """Ferme le WebDriver et le pool d'optimisation"""
+        if getattr(self, '_optimization_pool', None) is not None:
+            self._optimization_pool.shutdown(wait=True)
+            self._optimization_pool = None
+        
         if self.webdriver:
             try:
                 self.webdriver.quit()
                 self.driver_initialized = False
+                self._current_window_size = None
                 logger.info("🔚 WebDriver fermé")
             except Exception as e:
                 logger.error(f"❌ Erreur fermeture WebDriver: {e}")
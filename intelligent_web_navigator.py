@@ -6,6 +6,8 @@ Ce module gère la navigation autonome sur les sites web.
 import time
 import logging
 from typing import Dict, List, Any, Optional, Set
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -23,9 +25,17 @@ class NavigationSession:
 class SimpleWebNavigator:
     """Navigateur web autonome simplifié"""
 
-    def __init__(self, scraper_instance):
+    # Tous les mots-clés de classification et de qualité, trouvés en un seul parcours du contenu
+    _KEYWORDS_RE = re.compile(
+        r'\b(cours|formation|tutorial|actualité|news|documentation|api|guide|explication|principe)s?\b',
+        re.IGNORECASE
+    )
+    _QUALITY_INDICATORS = ('formation', 'cours', 'guide', 'explication', 'principe')
+
+    def __init__(self, scraper_instance, max_workers: int = 8):
         self.scraper = scraper_instance
         self.active_sessions: Dict[str, NavigationSession] = {}
+        self.max_workers = max_workers  # Pages téléchargées en parallèle
 
         logger.info("Navigateur web simplifié initialisé")
 
@@ -41,57 +51,76 @@ class SimpleWebNavigator:
         session = self.create_navigation_session(session_id)
 
         results = []
-        urls_to_visit = [start_url]
+        urls_to_visit = deque([start_url])
+        scheduled: Set[str] = set()
+        max_results = max_pages * 10  # 10x plus de pages autorisées
 
         logger.info(f"Navigation autonome depuis {start_url}")
 
-        while urls_to_visit and len(results) < (max_pages * 10):  # 10x plus de pages autorisées
-            url = urls_to_visit.pop(0)
+        # Les téléchargements (limités par le réseau) sont parallélisés ;
+        # l'analyse et la sélection des liens restent dans ce thread
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            in_flight = {}
 
-            if url in session.visited_urls:
-                continue
+            while True:
+                # Alimenter le pool sans dépasser le nombre de pages autorisé
+                while (urls_to_visit and len(in_flight) < self.max_workers
+                       and len(results) + len(in_flight) < max_results):
+                    url = urls_to_visit.popleft()
+
+                    if url in session.visited_urls or url in scheduled:
+                        continue
+
+                    scheduled.add(url)
+                    in_flight[executor.submit(self.scraper.scrape_url, url)] = url
 
-            # Scraper la page
-            scraping_result = self.scraper.scrape_url(url)
-            if scraping_result.success:
-                session.visited_urls.add(url)
+                if not in_flight:
+                    break
 
-                # Analyser la page
-                page_analysis = self._analyze_page_content(scraping_result)
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
 
-                results.append({
-                    'url': url,
-                    'analysis': page_analysis,
-                    'scraping_result': scraping_result
-                })
+                    # Scraper la page
+                    scraping_result = future.result()
+                    if not scraping_result.success:
+                        continue
 
-                # Ajouter quelques liens intéressants
-                interesting_links = self._select_interesting_links(
-                    scraping_result.links, session.visited_urls
-                )
-                urls_to_visit.extend(interesting_links[:3])
+                    session.visited_urls.add(url)
 
-            # Délai minimal entre les pages
-            time.sleep(0.05)  # 50ms seulement
+                    # Analyser la page
+                    page_analysis = self._analyze_page_content(scraping_result)
+
+                    results.append({
+                        'url': url,
+                        'analysis': page_analysis,
+                        'scraping_result': scraping_result
+                    })
+
+                    # Ajouter quelques liens intéressants
+                    interesting_links = self._select_interesting_links(
+                        scraping_result.links, session.visited_urls
+                    )
+                    urls_to_visit.extend(interesting_links[:3])
 
         logger.info(f"Navigation terminée: {len(results)} pages visitées")
         return results
 
     def _analyze_page_content(self, scraping_result) -> Dict[str, Any]:
         """Analyse simplifiée du contenu de page"""
-        content_lower = scraping_result.content.lower()
+        keywords = self._find_keywords(scraping_result.content)
 
         # Déterminer le type de contenu
         content_type = "general"
-        if any(term in content_lower for term in ['cours', 'formation', 'tutorial']):
+        if keywords & {'cours', 'formation', 'tutorial'}:
             content_type = "educational"
-        elif any(term in content_lower for term in ['actualité', 'news']):
+        elif keywords & {'actualité', 'news'}:
             content_type = "news"
-        elif any(term in content_lower for term in ['documentation', 'api']):
+        elif keywords & {'documentation', 'api'}:
             content_type = "technical"
 
         # Calculer la qualité du contenu
-        quality_score = self._calculate_content_quality(scraping_result)
+        quality_score = self._calculate_content_quality(scraping_result, keywords)
 
         return {
             'content_type': content_type,
@@ -124,14 +153,20 @@ class SimpleWebNavigator:
 
         return interesting[:5]  # Limiter à 5 liens
 
-    def _calculate_content_quality(self, result) -> int:
+    def _find_keywords(self, content: str) -> Set[str]:
+        """Mots-clés présents dans le contenu (en minuscules)"""
+        return {match.lower() for match in self._KEYWORDS_RE.findall(content)}
+
+    def _calculate_content_quality(self, result, keywords: Optional[Set[str]] = None) -> int:
         """Calcule un score de qualité simple"""
         score = 0
+        content = result.content
+        content_length = len(content)
 
         # Longueur du contenu
-        if len(result.content) > 1000:
+        if content_length > 1000:
             score += 3
-        elif len(result.content) > 500:
+        elif content_length > 500:
             score += 2
 
         # Présence de titre
@@ -143,9 +178,9 @@ class SimpleWebNavigator:
             score += 2
 
         # Indicateurs de qualité dans le contenu
-        content_lower = result.content.lower()
-        quality_indicators = ['formation', 'cours', 'guide', 'explication', 'principe']
-        score += sum(1 for indicator in quality_indicators if indicator in content_lower)
+        if keywords is None:
+            keywords = self._find_keywords(content)
+        score += len(keywords.intersection(self._QUALITY_INDICATORS))
 
         return min(score, 10)
 
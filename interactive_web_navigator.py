@@ -5,21 +5,34 @@ Ce module permet à l'API Gemini d'interagir avec les éléments des sites web
 """
 
 import logging
+import sys
 import time
 import json
 import hashlib
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple, Set
+import itertools
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple, Set, Deque
 from dataclasses import dataclass, field
 from pathlib import Path
 import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
 from urllib.parse import urljoin, urlparse
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('InteractiveWebNavigator')
 
-@dataclass
+# __slots__ générés par dataclass (Python 3.10+) : instances sans __dict__, plus légères
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class InteractiveElement:
     """Représente un élément interactif sur une page web"""
     element_id: str
@@ -32,36 +45,243 @@ class InteractiveElement:
     is_clickable: bool
     attributes: Dict[str, str]
     interaction_score: float  # Score d'importance pour l'interaction
+    best_locator: Tuple[str, str]  # (stratégie By, sélecteur) retenue pour retrouver l'élément
     
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class InteractionResult:
     """Résultat d'une interaction avec un élément"""
     success: bool
-    element: InteractiveElement
+    element_id: Optional[str]  # Identifiant de l'élément ciblé (pas de référence à l'élément lui-même)
     action_performed: str
     new_url: Optional[str]
     page_changed: bool
+    element_text: Optional[str] = None
     error_message: str = ""
     execution_time: float = 0.0
     screenshot_path: Optional[str] = None
 
-@dataclass
+class DiscoveredElements(list):
+    """
+    Éléments interactifs d'une page, triés par score décroissant
+    
+    Reste une liste d'InteractiveElement, mais les types et les scores sont aussi
+    rangés dans des tableaux compacts pour filtrer sans parcourir les objets.
+    C'est un instantané : il est remplacé à chaque analyse, jamais modifié.
+    """
+    
+    TYPE_CODES = {
+        'buttons': 0, 'tabs': 1, 'links': 2, 'navigation': 3,
+        'forms': 4, 'inputs': 5, 'accordion': 6, 'dropdown': 7
+    }
+    
+    def __init__(self, elements: List[InteractiveElement] = ()):
+        super().__init__(elements)
+        self._indices_by_type: Optional[Dict[str, List[int]]] = None  # Partition construite à la demande
+        if NUMPY_AVAILABLE:
+            self.type_codes = np.fromiter(
+                (self.TYPE_CODES.get(elem.element_type, -1) for elem in self), dtype=np.int8, count=len(self)
+            )
+            self.scores = np.fromiter((elem.interaction_score for elem in self), dtype=np.float64, count=len(self))
+    
+    def filter_type(self, element_type: str, min_score: Optional[float] = None):
+        """Indices (dans l'ordre de la liste) des éléments d'un type, au score éventuellement > min_score"""
+        if not NUMPY_AVAILABLE or element_type not in self.TYPE_CODES:
+            if self._indices_by_type is None:
+                # Une seule passe sur la liste, partagée par tous les filtres suivants
+                self._indices_by_type = {}
+                for i, elem in enumerate(self):
+                    self._indices_by_type.setdefault(elem.element_type, []).append(i)
+            indices = self._indices_by_type.get(element_type, [])
+            if min_score is None:
+                return list(indices)
+            return [i for i in indices if self[i].interaction_score > min_score]
+        
+        mask = self.type_codes == self.TYPE_CODES[element_type]
+        if min_score is not None:
+            mask &= self.scores > min_score
+        return np.flatnonzero(mask)
+
+@dataclass(**_DATACLASS_SLOTS)
 class NavigationSession:
     """Session de navigation interactive"""
     session_id: str
     start_url: str
     current_url: str
-    visited_urls: List[str]
-    interactions_performed: List[InteractionResult]
-    discovered_elements: List[InteractiveElement]
+    visited_urls: Dict[str, None]  # URLs visitées dans l'ordre (dict : ensemble ordonné, test d'appartenance O(1))
+    interactions_performed: Deque[InteractionResult]  # Dernières interactions seulement (deque bornée)
+    discovered_elements: 'DiscoveredElements'
     navigation_depth: int
-    session_start_time: datetime
-    last_interaction_time: datetime
+    session_start_time: float  # time.monotonic() : durée de session sans passer par datetime
+    last_interaction_time: float
     goals: List[str]  # Objectifs de navigation
+    elements_by_id: Dict[str, InteractiveElement] = field(default_factory=dict)  # Index de discovered_elements
+    interaction_count: int = 0  # Total des interactions, y compris celles sorties de la deque
+    successful_interaction_count: int = 0
+    # (liste d'éléments analysée, suggestions calculées) : valable tant que discovered_elements n'est pas remplacé
+    suggestions_cache: Optional[Tuple['DiscoveredElements', List[Dict[str, Any]]]] = None
     
 class InteractiveElementAnalyzer:
     """Analyseur d'éléments interactifs sur une page web"""
     
+    # Attributs conservés pour chaque élément
+    _IMPORTANT_ATTRIBUTES = [
+        'id', 'class', 'name', 'type', 'role', 'aria-label', 
+        'title', 'href', 'onclick', 'data-tab', 'data-toggle'
+    ]
+    
+    # Score de base selon le type d'élément
+    _TYPE_SCORES = {
+        'buttons': 0.8,
+        'tabs': 0.7,
+        'links': 0.6,
+        'navigation': 0.7,
+        'forms': 0.5,
+        'inputs': 0.4,
+        'accordion': 0.6,
+        'dropdown': 0.5
+    }
+    
+    # Parcours du DOM exécuté dans le navigateur : un seul aller-retour WebDriver par page
+    # (arguments[0] : paires [catégorie, sélecteur], arguments[1] : attributs à extraire).
+    # Chaque nœud n'est décrit qu'une fois, avec toutes les catégories qui l'ont sélectionné.
+    _COLLECT_ELEMENTS_JS = """
+        const flatSelectors = arguments[0];
+        const attributeNames = arguments[1];
+        
+        function getXPath(element) {
+            if (element.id !== '') {
+                return '//*[@id="' + element.id + '"]';
+            }
+            if (element === document.body) {
+                return '/html/body';
+            }
+            
+            var ix = 0;
+            var siblings = element.parentNode.childNodes;
+            for (var i = 0; i < siblings.length; i++) {
+                var sibling = siblings[i];
+                if (sibling === element) {
+                    return getXPath(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
+                }
+                if (sibling.nodeType === 1 && sibling.tagName === element.tagName) {
+                    ix++;
+                }
+            }
+        }
+        
+        // Même règle que InteractiveElementAnalyzer._generate_css_selector
+        function cssSelector(tag, attrs) {
+            if (attrs.id) return '#' + attrs.id;
+            const classes = (attrs['class'] || '').split(/\\s+/).filter(Boolean);
+            if (classes.length) return tag + '.' + classes.join('.');
+            for (const name of ['name', 'type', 'role', 'data-tab']) {
+                if (attrs[name]) return tag + '[' + name + "='" + attrs[name] + "']";
+            }
+            return tag;
+        }
+        
+        // Sélecteur CSS s'il désigne ce seul nœud (et est valide), XPath sinon
+        function bestLocator(el, css, xpath) {
+            try {
+                const matches = document.querySelectorAll(css);
+                if (matches.length === 1 && matches[0] === el) return ['css selector', css];
+            } catch (e) {}
+            return ['xpath', xpath];
+        }
+        
+        const results = [];
+        const byNode = new Map();
+        for (const [category, selector] of flatSelectors) {
+            let nodes;
+            try {
+                nodes = document.querySelectorAll(selector);
+            } catch (e) {
+                continue;
+            }
+            for (const el of nodes) {
+                const known = byNode.get(el);
+                if (known !== undefined) {
+                    if (known && !known.categories.includes(category)) known.categories.push(category);
+                    continue;
+                }
+                
+                const rect = el.getBoundingClientRect();
+                const style = getComputedStyle(el);
+                if (rect.width === 0 || rect.height === 0
+                    || style.visibility === 'hidden' || style.display === 'none') {
+                    byNode.set(el, null);
+                    continue;
+                }
+                
+                const attrs = {};
+                for (const name of attributeNames) {
+                    const value = el.getAttribute(name);
+                    if (value) attrs[name] = value;
+                }
+                
+                let text = (el.innerText || '').trim();
+                if (!text) {
+                    for (const name of ['aria-label', 'title', 'alt', 'value', 'placeholder']) {
+                        const value = name === 'value' ? el.value : el.getAttribute(name);
+                        if (value) {
+                            text = String(value).trim();
+                            break;
+                        }
+                    }
+                }
+                if (!text) text = (el.textContent || '').trim();
+                
+                const tag = el.tagName.toLowerCase();
+                const css = cssSelector(tag, attrs);
+                const xpath = getXPath(el) || '';
+                const record = {
+                    categories: [category],
+                    tag: tag,
+                    text: text.slice(0, 200),
+                    attrs: attrs,
+                    x: Math.round(rect.left + window.scrollX),
+                    y: Math.round(rect.top + window.scrollY),
+                    width: Math.round(rect.width),
+                    height: Math.round(rect.height),
+                    enabled: !el.disabled,
+                    css: css,
+                    xpath: xpath,
+                    locator: bestLocator(el, css, xpath)
+                };
+                byNode.set(el, record);
+                results.push(record);
+            }
+        }
+        return results;
+    """
+    
+    # Fonction XPath du mode de repli, installée une fois par page puis appelée par son nom
+    _INSTALL_XPATH_JS = """
+        window.__axGetXPath = function getXPath(element) {
+            if (element.id !== '') {
+                return '//*[@id="' + element.id + '"]';
+            }
+            if (element === document.body) {
+                return '/html/body';
+            }
+            
+            var ix = 0;
+            var siblings = element.parentNode.childNodes;
+            for (var i = 0; i < siblings.length; i++) {
+                var sibling = siblings[i];
+                if (sibling === element) {
+                    return getXPath(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
+                }
+                if (sibling.nodeType === 1 && sibling.tagName === element.tagName) {
+                    ix++;
+                }
+            }
+        };
+    """
+    
+    # null uniquement si la fonction n'est pas encore installée sur la page courante
+    _CALL_XPATH_JS = "return window.__axGetXPath ? (window.__axGetXPath(arguments[0]) || '') : null;"
+    
     def __init__(self):
         # Sélecteurs CSS pour différents types d'éléments interactifs
         self.element_selectors = {
@@ -121,72 +341,217 @@ class InteractiveElementAnalyzer:
             'medium': ['more', 'details', 'info', 'about', 'contact', 'help', 'support'],
             'low': ['home', 'back', 'close', 'cancel']
         }
+        
+        # Une expression compilée par niveau d'importance (recherche de sous-chaîne, insensible à la casse)
+        self._keyword_patterns = {
+            importance: re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE)
+            for importance, keywords in self.importance_keywords.items()
+        }
+        self._keyword_bonus = {'high': 0.3, 'medium': 0.2, 'low': 0.1}
+        
+        # Types encodés en entiers pour le calcul vectorisé des scores (dernier indice : type inconnu)
+        self._type_codes = {element_type: code for code, element_type in enumerate(self._TYPE_SCORES)}
+        if NUMPY_AVAILABLE:
+            self._type_score_array = np.array(list(self._TYPE_SCORES.values()) + [0.3])
+        
+        # Paires (catégorie, sélecteur) aplaties une fois pour toutes
+        self._flat_selectors = [
+            (category, selector)
+            for category, selectors in self.element_selectors.items()
+            for selector in selectors
+        ]
+        
+        # Identifiants d'éléments uniques pour toute la vie de l'analyseur (jamais réutilisés)
+        self._id_counter = itertools.count(1)
     
-    def analyze_page_elements(self, webdriver) -> List[InteractiveElement]:
+    def analyze_page_elements(self, webdriver) -> 'DiscoveredElements':
         """Analyse tous les éléments interactifs d'une page"""
+        try:
+            raw_elements = webdriver.execute_script(
+                self._COLLECT_ELEMENTS_JS, self._flat_selectors, self._IMPORTANT_ATTRIBUTES
+            )
+        except Exception as e:
+            logger.debug(f"Collecte JavaScript indisponible, analyse élément par élément: {e}")
+            return self._analyze_page_elements_per_element(webdriver)
+        
         elements = []
-        element_counter = 0
         
         try:
-            for element_type, selectors in self.element_selectors.items():
-                for selector in selectors:
-                    try:
-                        web_elements = webdriver.find_elements('css selector', selector)
-                        
-                        for web_element in web_elements:
-                            try:
-                                # Vérifier si l'élément est visible et interactif
-                                if not web_element.is_displayed():
-                                    continue
-                                
-                                element_counter += 1
-                                element_id = f"elem_{element_counter}_{int(time.time() * 1000)}"
-                                
-                                # Extraire les informations de l'élément
-                                text = self._extract_element_text(web_element)
-                                xpath = self._get_element_xpath(webdriver, web_element)
-                                css_sel = self._generate_css_selector(web_element)
-                                position = self._get_element_position(web_element)
-                                attributes = self._extract_element_attributes(web_element)
-                                is_clickable = self._is_element_clickable(web_element)
-                                
-                                # Calculer le score d'interaction
-                                interaction_score = self._calculate_interaction_score(
-                                    text, attributes, element_type, position
-                                )
-                                
-                                interactive_element = InteractiveElement(
-                                    element_id=element_id,
-                                    element_type=element_type,
-                                    text=text,
-                                    xpath=xpath,
-                                    css_selector=css_sel,
-                                    position=position,
-                                    is_visible=True,
-                                    is_clickable=is_clickable,
-                                    attributes=attributes,
-                                    interaction_score=interaction_score
-                                )
-                                
-                                elements.append(interactive_element)
-                                
-                            except Exception as e:
-                                logger.debug(f"Erreur analyse élément individuel: {e}")
-                                continue
-                                
-                    except Exception as e:
-                        logger.debug(f"Erreur sélecteur {selector}: {e}")
+            element_types = [self._best_category(raw['categories']) for raw in raw_elements]
+            
+            # Scores calculés pour toute la page d'un coup, puis ordre décroissant
+            if NUMPY_AVAILABLE:
+                scores = self.score_batch({
+                    'types': element_types,
+                    'texts': [raw['text'] for raw in raw_elements],
+                    'y': [raw['y'] for raw in raw_elements],
+                    'width': [raw['width'] for raw in raw_elements],
+                    'height': [raw['height'] for raw in raw_elements],
+                    'has_id': ['id' in raw['attrs'] for raw in raw_elements],
+                    'has_aria': ['aria-label' in raw['attrs'] for raw in raw_elements]
+                })
+                order = np.argsort(-scores, kind='stable').tolist()
+                scores = scores.tolist()
+            else:
+                scores = [
+                    self._calculate_interaction_score(
+                        raw['text'], raw['attrs'], element_type, {'y': raw['y'], 'width': raw['width'], 'height': raw['height']}
+                    )
+                    for raw, element_type in zip(raw_elements, element_types)
+                ]
+                order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+            
+            for index in order:
+                raw = raw_elements[index]
+                element_id = f"elem_{next(self._id_counter)}"
+                element_type = element_types[index]
+                attributes = raw['attrs']
+                position = {
+                    'x': raw['x'],
+                    'y': raw['y'],
+                    'width': raw['width'],
+                    'height': raw['height']
+                }
+                interaction_score = scores[index]
+                
+                elements.append(InteractiveElement(
+                    element_id=element_id,
+                    element_type=element_type,
+                    text=raw['text'],
+                    xpath=raw['xpath'],
+                    css_selector=raw['css'],
+                    position=position,
+                    is_visible=True,
+                    is_clickable=raw['enabled'] and self._is_clickable_from_attributes(raw['tag'], attributes),
+                    attributes=attributes,
+                    interaction_score=interaction_score,
+                    best_locator=tuple(raw['locator'])
+                ))
+            
+            logger.info(f"🔍 Analysé {len(elements)} éléments interactifs")
+            return DiscoveredElements(elements)
+            
+        except Exception as e:
+            logger.error(f"❌ Erreur analyse éléments page: {e}")
+            return DiscoveredElements()
+    
+    def score_batch(self, features: Dict[str, List[Any]]) -> 'np.ndarray':
+        """
+        Version vectorisée de _calculate_interaction_score pour tous les éléments d'une page
+        
+        Args:
+            features: listes parallèles 'types', 'texts', 'y', 'width', 'height', 'has_id', 'has_aria'
+            
+        Returns:
+            Tableau des scores, dans l'ordre des listes d'entrée
+        """
+        unknown_code = len(self._type_codes)
+        type_codes = np.fromiter(
+            (self._type_codes.get(element_type, unknown_code) for element_type in features['types']),
+            dtype=np.intp, count=len(features['types'])
+        )
+        scores = self._type_score_array[type_codes]
+        
+        # Bonus de mots-clés : une recherche par niveau et par texte
+        # (mêmes additions, dans le même ordre, que la version scalaire)
+        for importance, pattern in self._keyword_patterns.items():
+            bonus = self._keyword_bonus[importance]
+            for i, text in enumerate(features['texts']):
+                if pattern.search(text):
+                    scores[i] += bonus
+        
+        y = np.asarray(features['y'], dtype=np.float64)
+        area = np.asarray(features['width'], dtype=np.float64) * np.asarray(features['height'], dtype=np.float64)
+        scores = scores + np.where(y < 600, 0.2, 0.0)
+        scores = scores + np.where(area > 10000, 0.1, 0.0)
+        scores = scores + np.where(np.asarray(features['has_id'], dtype=bool), 0.1, 0.0)
+        scores = scores + np.where(np.asarray(features['has_aria'], dtype=bool), 0.1, 0.0)
+        
+        return np.minimum(scores, 1.0)
+    
+    def _best_category(self, categories: List[str]) -> str:
+        """Parmi les catégories d'un même nœud, retient celle au score de base le plus élevé"""
+        return max(categories, key=lambda category: self._TYPE_SCORES.get(category, 0.3))
+    
+    @staticmethod
+    def _is_clickable_from_attributes(tag_name: str, attributes: Dict[str, str]) -> bool:
+        """Détermine si un élément (visible et actif) est cliquable d'après son tag et ses attributs"""
+        if tag_name in ['a', 'button', 'input', 'select']:
+            return True
+        return attributes.get('role') in ['button', 'link', 'tab'] or bool(attributes.get('onclick'))
+    
+    def _analyze_page_elements_per_element(self, webdriver) -> 'DiscoveredElements':
+        """Analyse élément par élément via WebDriver (repli si l'exécution de JavaScript échoue)"""
+        elements = []
+        
+        try:
+            # Regrouper les nœuds par identité WebDriver : chacun n'est examiné qu'une fois
+            matched: Dict[str, Tuple[Any, List[str]]] = {}
+            for element_type, selector in self._flat_selectors:
+                try:
+                    for web_element in webdriver.find_elements('css selector', selector):
+                        if web_element.id in matched:
+                            categories = matched[web_element.id][1]
+                            if element_type not in categories:
+                                categories.append(element_type)
+                        else:
+                            matched[web_element.id] = (web_element, [element_type])
+                except Exception as e:
+                    logger.debug(f"Erreur sélecteur {selector}: {e}")
+                    continue
+            
+            for web_element, categories in matched.values():
+                try:
+                    # Vérifier si l'élément est visible et interactif
+                    if not web_element.is_displayed():
                         continue
+                    
+                    element_id = f"elem_{next(self._id_counter)}"
+                    element_type = self._best_category(categories)
+                    
+                    # Extraire les informations de l'élément
+                    text = self._extract_element_text(web_element)
+                    xpath = self._get_element_xpath(webdriver, web_element)
+                    css_sel = self._generate_css_selector(web_element)
+                    position = self._get_element_position(web_element)
+                    attributes = self._extract_element_attributes(web_element)
+                    is_clickable = self._is_element_clickable(web_element)
+                    
+                    # Calculer le score d'interaction
+                    interaction_score = self._calculate_interaction_score(
+                        text, attributes, element_type, position
+                    )
+                    
+                    interactive_element = InteractiveElement(
+                        element_id=element_id,
+                        element_type=element_type,
+                        text=text,
+                        xpath=xpath,
+                        css_selector=css_sel,
+                        position=position,
+                        is_visible=True,
+                        is_clickable=is_clickable,
+                        attributes=attributes,
+                        interaction_score=interaction_score,
+                        # XPath construit nœud par nœud : désigne cet élément sans vérification supplémentaire
+                        best_locator=('xpath', xpath) if xpath else ('css selector', css_sel)
+                    )
+                    
+                    elements.append(interactive_element)
+                    
+                except Exception as e:
+                    logger.debug(f"Erreur analyse élément individuel: {e}")
+                    continue
             
             # Trier par score d'interaction (plus important en premier)
             elements.sort(key=lambda x: x.interaction_score, reverse=True)
             
             logger.info(f"🔍 Analysé {len(elements)} éléments interactifs")
-            return elements
+            return DiscoveredElements(elements)
             
         except Exception as e:
             logger.error(f"❌ Erreur analyse éléments page: {e}")
-            return []
+            return DiscoveredElements()
     
     def _extract_element_text(self, element) -> str:
         """Extrait le texte d'un élément"""
@@ -203,12 +568,10 @@ class InteractiveElementAnalyzer:
                         break
             
             if not text:
-                # Essayer le contenu HTML
-                innerHTML = element.get_attribute('innerHTML')
-                if innerHTML:
-                    # Supprimer les balises HTML basiques
-                    import re
-                    text = re.sub(r'<[^>]+>', '', innerHTML).strip()
+                # Texte brut calculé par le navigateur (inclut le texte masqué, entités déjà décodées)
+                text_content = element.get_property('textContent')
+                if text_content:
+                    text = text_content.strip()
             
             return text[:200]  # Limiter la longueur
             
@@ -218,29 +581,12 @@ class InteractiveElementAnalyzer:
     def _get_element_xpath(self, webdriver, element) -> str:
         """Génère le XPath d'un élément"""
         try:
-            return webdriver.execute_script("""
-                function getXPath(element) {
-                    if (element.id !== '') {
-                        return '//*[@id="' + element.id + '"]';
-                    }
-                    if (element === document.body) {
-                        return '/html/body';
-                    }
-                    
-                    var ix = 0;
-                    var siblings = element.parentNode.childNodes;
-                    for (var i = 0; i < siblings.length; i++) {
-                        var sibling = siblings[i];
-                        if (sibling === element) {
-                            return getXPath(element.parentNode) + '/' + element.tagName.toLowerCase() + '[' + (ix + 1) + ']';
-                        }
-                        if (sibling.nodeType === 1 && sibling.tagName === element.tagName) {
-                            ix++;
-                        }
-                    }
-                }
-                return getXPath(arguments[0]);
-            """, element)
+            xpath = webdriver.execute_script(self._CALL_XPATH_JS, element)
+            if xpath is None:
+                # Fonction absente de cette page (nouvelle page) : l'installer puis réessayer
+                webdriver.execute_script(self._INSTALL_XPATH_JS)
+                xpath = webdriver.execute_script(self._CALL_XPATH_JS, element)
+            return xpath or ""
         except Exception:
             return ""
     
@@ -290,13 +636,9 @@ class InteractiveElementAnalyzer:
     def _extract_element_attributes(self, element) -> Dict[str, str]:
         """Extrait les attributs importants d'un élément"""
         attributes = {}
-        important_attributes = [
-            'id', 'class', 'name', 'type', 'role', 'aria-label', 
-            'title', 'href', 'onclick', 'data-tab', 'data-toggle'
-        ]
         
         try:
-            for attr in important_attributes:
+            for attr in self._IMPORTANT_ATTRIBUTES:
                 value = element.get_attribute(attr)
                 if value:
                     attributes[attr] = value
@@ -337,30 +679,12 @@ class InteractiveElementAnalyzer:
         score = 0.0
         
         # Score de base selon le type d'élément
-        type_scores = {
-            'buttons': 0.8,
-            'tabs': 0.7,
-            'links': 0.6,
-            'navigation': 0.7,
-            'forms': 0.5,
-            'inputs': 0.4,
-            'accordion': 0.6,
-            'dropdown': 0.5
-        }
-        score += type_scores.get(element_type, 0.3)
-        
-        # Score basé sur le texte
-        text_lower = text.lower()
-        for importance, keywords in self.importance_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    if importance == 'high':
-                        score += 0.3
-                    elif importance == 'medium':
-                        score += 0.2
-                    else:
-                        score += 0.1
-                    break
+        score += self._TYPE_SCORES.get(element_type, 0.3)
+        
+        # Score basé sur le texte (un bonus par niveau d'importance rencontré)
+        for importance, pattern in self._keyword_patterns.items():
+            if pattern.search(text):
+                score += self._keyword_bonus[importance]
         
         # Score basé sur la position (éléments plus hauts sont souvent plus importants)
         if position['y'] < 600:  # Au-dessus du pli
@@ -382,12 +706,32 @@ class InteractiveElementAnalyzer:
 class InteractiveWebNavigator:
     """Navigateur web interactif principal"""
     
+    # Observateur de mutations installé une fois par page (perdu à chaque navigation)
+    _INSTALL_MUTATION_OBSERVER_JS = """
+        if (!window.__axObserver && document.body) {
+            window.__axMutated = false;
+            window.__axObserver = new MutationObserver(() => { window.__axMutated = true; });
+            window.__axObserver.observe(document.body, {subtree: true, childList: true, attributes: true});
+        }
+    """
+    
+    # Lit et réarme l'indicateur de mutation (true si l'observateur est absent : on ne sait pas)
+    _TAKE_MUTATION_FLAG_JS = """
+        if (window.__axMutated === undefined) return true;
+        const m = window.__axMutated;
+        window.__axMutated = false;
+        return m;
+    """
+    
     def __init__(self):
         self.element_analyzer = InteractiveElementAnalyzer()
         self.active_sessions: Dict[str, NavigationSession] = {}
         self.webdriver = None
         self.screenshots_dir = Path("interactive_screenshots")
         self.screenshots_dir.mkdir(exist_ok=True)
+        # Écriture des captures sur disque hors du fil principal (le driver reste sur le fil principal) ;
+        # créé à la première capture, et de nouveau après shutdown()
+        self._screenshot_pool: Optional[ThreadPoolExecutor] = None
         
         # Configuration
         self.config = {
@@ -395,6 +739,7 @@ class InteractiveWebNavigator:
             'interaction_timeout': 30,
             'page_load_timeout': 15,
             'element_wait_timeout': 10,
+            'interaction_settle_timeout': 1.0,  # Attente maximale d'un changement d'URL après une action
             'screenshot_on_interaction': True
         }
         
@@ -406,6 +751,8 @@ class InteractiveWebNavigator:
             'pages_navigated': 0,
             'elements_discovered': 0
         }
+        # Version incrémentée à chaque mise à jour des compteurs (exposée par get_statistics)
+        self._stats_version = 0
     
     def initialize_webdriver(self) -> bool:
         """Initialise le WebDriver pour l'interaction"""
@@ -447,21 +794,23 @@ class InteractiveWebNavigator:
     def create_interactive_session(self, session_id: str, start_url: str, 
                                  navigation_goals: List[str] = None) -> NavigationSession:
         """Crée une nouvelle session de navigation interactive"""
+        now = time.monotonic()
         session = NavigationSession(
             session_id=session_id,
             start_url=start_url,
             current_url=start_url,
-            visited_urls=[],
-            interactions_performed=[],
-            discovered_elements=[],
+            visited_urls={},
+            interactions_performed=deque(maxlen=self.config['max_interactions_per_session']),
+            discovered_elements=DiscoveredElements(),
             navigation_depth=0,
-            session_start_time=datetime.now(),
-            last_interaction_time=datetime.now(),
+            session_start_time=now,
+            last_interaction_time=now,
             goals=navigation_goals or []
         )
         
         self.active_sessions[session_id] = session
         self.stats['sessions_created'] += 1
+        self._stats_version += 1
         
         logger.info(f"🎯 Session interactive créée: {session_id}")
         return session
@@ -482,23 +831,28 @@ class InteractiveWebNavigator:
             self.webdriver.get(url)
             
             # Attendre le chargement complet
-            time.sleep(3)
+            self._wait_for_page_ready()
             
             # Mettre à jour la session
             session.current_url = self.webdriver.current_url
-            if url not in session.visited_urls:
-                session.visited_urls.append(url)
+            if self._mark_visited(session, url):
                 self.stats['pages_navigated'] += 1
             
+            # Prendre une capture d'écran (écrite sur disque pendant l'analyse des éléments)
+            screenshot_write = None
+            if self.config['screenshot_on_interaction']:
+                screenshot_write = self._take_screenshot(f"navigation_{session_id}")
+            
             # Analyser les éléments interactifs
             elements = self.element_analyzer.analyze_page_elements(self.webdriver)
             session.discovered_elements = elements
+            session.elements_by_id = {elem.element_id: elem for elem in elements}
+            self._install_mutation_observer()
             self.stats['elements_discovered'] += len(elements)
+            self._stats_version += 1
             
-            # Prendre une capture d'écran
-            screenshot_path = None
-            if self.config['screenshot_on_interaction']:
-                screenshot_path = self._take_screenshot(f"navigation_{session_id}")
+            # Chemin rendu seulement une fois le fichier écrit
+            screenshot_path = screenshot_write.result() if screenshot_write else None
             
             return {
                 'success': True,
@@ -527,7 +881,7 @@ class InteractiveWebNavigator:
         if session_id not in self.active_sessions:
             return InteractionResult(
                 success=False,
-                element=None,
+                element_id=element_id,
                 action_performed=action,
                 new_url=None,
                 page_changed=False,
@@ -535,19 +889,15 @@ class InteractiveWebNavigator:
             )
         
         session = self.active_sessions[session_id]
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Trouver l'élément dans la session
-        target_element = None
-        for elem in session.discovered_elements:
-            if elem.element_id == element_id:
-                target_element = elem
-                break
+        target_element = session.elements_by_id.get(element_id)
         
         if not target_element:
             return InteractionResult(
                 success=False,
-                element=None,
+                element_id=element_id,
                 action_performed=action,
                 new_url=None,
                 page_changed=False,
@@ -557,41 +907,25 @@ class InteractiveWebNavigator:
         try:
             current_url = self.webdriver.current_url
             
-            # Localiser l'élément sur la page
-            web_element = None
-            
-            # Essayer par CSS selector en premier
-            if target_element.css_selector:
-                try:
-                    web_element = self.webdriver.find_element(self.By.CSS_SELECTOR, target_element.css_selector)
-                except:
-                    pass
-            
-            # Essayer par XPath si CSS a échoué
-            if not web_element and target_element.xpath:
-                try:
-                    web_element = self.webdriver.find_element(self.By.XPATH, target_element.xpath)
-                except:
-                    pass
-            
-            if not web_element:
+            # Localiser l'élément sur la page : un seul appel, avec le localisateur choisi à l'analyse
+            strategy, selector = target_element.best_locator
+            try:
+                web_element = self.webdriver.find_element(strategy, selector)
+            except Exception:
                 return InteractionResult(
                     success=False,
-                    element=target_element,
+                    element_id=element_id,
                     action_performed=action,
                     new_url=None,
                     page_changed=False,
+                    element_text=target_element.text,
                     error_message="Impossible de localiser l'élément sur la page"
                 )
             
-            # Scroller vers l'élément si nécessaire
-            self.webdriver.execute_script("arguments[0].scrollIntoView();", web_element)
-            time.sleep(0.5)
-            
             # Effectuer l'action
             success = False
             if action == 'click':
-                # Essayer le clic normal
+                # Essayer le clic normal (WebDriver fait défiler l'élément dans la vue lui-même)
                 try:
                     web_element.click()
                     success = True
@@ -605,68 +939,88 @@ class InteractiveWebNavigator:
             
             elif action == 'hover':
                 try:
+                    # Le survol par actions ne fait pas défiler : amener l'élément dans la vue (synchrone)
+                    self.webdriver.execute_script("arguments[0].scrollIntoView();", web_element)
                     actions = self.ActionChains(self.webdriver)
                     actions.move_to_element(web_element).perform()
                     success = True
                 except Exception as e:
                     logger.error(f"Erreur hover: {e}")
             
-            # Attendre les changements potentiels
-            time.sleep(2)
+            # Attendre les changements potentiels : navigation éventuelle puis chargement
+            try:
+                self.WebDriverWait(
+                    self.webdriver, self.config['interaction_settle_timeout'], poll_frequency=0.05
+                ).until(self.EC.url_changes(current_url))
+            except Exception:
+                pass  # Toutes les actions ne changent pas d'URL
+            self._wait_for_page_ready()
             
             # Vérifier si la page a changé
             new_url = self.webdriver.current_url
             page_changed = (new_url != current_url)
+            dom_mutated = page_changed or self._take_mutation_flag()
             
-            # Prendre une capture d'écran après l'interaction
-            screenshot_path = None
-            if self.config['screenshot_on_interaction']:
-                screenshot_path = self._take_screenshot(f"interaction_{session_id}_{element_id}")
+            # Prendre une capture d'écran après l'interaction, seulement si l'URL ou le DOM a changé
+            # (écrite sur disque pendant la réanalyse des éléments)
+            screenshot_write = None
+            if self.config['screenshot_on_interaction'] and dom_mutated:
+                screenshot_write = self._take_screenshot(f"interaction_{session_id}_{element_id}")
             
             # Créer le résultat
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             result = InteractionResult(
                 success=success,
-                element=target_element,
+                element_id=element_id,
                 action_performed=action,
                 new_url=new_url if page_changed else None,
                 page_changed=page_changed,
-                execution_time=execution_time,
-                screenshot_path=screenshot_path
+                element_text=target_element.text,
+                execution_time=execution_time
             )
             
             # Mettre à jour la session
             session.interactions_performed.append(result)
-            session.last_interaction_time = datetime.now()
+            session.interaction_count += 1
+            if success:
+                session.successful_interaction_count += 1
+            session.last_interaction_time = time.monotonic()
             if page_changed:
                 session.current_url = new_url
-                if new_url not in session.visited_urls:
-                    session.visited_urls.append(new_url)
+                self._mark_visited(session, new_url)
             
-            # Réanalyser les éléments si la page a changé
-            if page_changed:
-                time.sleep(1)  # Attendre le chargement
+            # Réanalyser les éléments si la page ou son DOM a changé
+            if dom_mutated:
+                previous_elements = session.discovered_elements
                 session.discovered_elements = self.element_analyzer.analyze_page_elements(self.webdriver)
+                if not page_changed:
+                    self._carry_over_element_ids(previous_elements, session.discovered_elements)
+                session.elements_by_id = {elem.element_id: elem for elem in session.discovered_elements}
+                self._install_mutation_observer()
             
             # Mettre à jour les statistiques
             self.stats['interactions_performed'] += 1
             if success:
                 self.stats['successful_interactions'] += 1
+            self._stats_version += 1
             
             logger.info(f"{'✅' if success else '❌'} Interaction {action} sur {target_element.text[:30]} - "
                        f"Page changée: {page_changed}")
             
+            # Chemin rendu seulement une fois le fichier écrit
+            result.screenshot_path = screenshot_write.result() if screenshot_write else None
             return result
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             logger.error(f"❌ Erreur interaction: {e}")
             return InteractionResult(
                 success=False,
-                element=target_element,
+                element_id=element_id,
                 action_performed=action,
                 new_url=None,
                 page_changed=False,
+                element_text=target_element.text,
                 error_message=str(e),
                 execution_time=execution_time
             )
@@ -716,88 +1070,173 @@ class InteractiveWebNavigator:
     
     def _generate_interaction_suggestions(self, session: NavigationSession) -> List[Dict[str, Any]]:
         """Génère des suggestions d'interaction basées sur les objectifs"""
+        # discovered_elements est remplacé à chaque analyse, jamais modifié : le cache suit son identité
+        cache = session.suggestions_cache
+        if cache is not None and cache[0] is session.discovered_elements:
+            return cache[1]
+        
         suggestions = []
         
+        elements = session.discovered_elements
+        if not isinstance(elements, DiscoveredElements):
+            elements = DiscoveredElements(elements)
+        
         # Identifier les onglets disponibles
-        tab_elements = [elem for elem in session.discovered_elements if elem.element_type == 'tabs']
-        if tab_elements:
+        tab_indices = elements.filter_type('tabs')
+        if len(tab_indices):
             suggestions.append({
                 'type': 'explore_tabs',
-                'description': f"Explorer {len(tab_elements)} onglets disponibles",
-                'elements': [elem.element_id for elem in tab_elements[:5]]
+                'description': f"Explorer {len(tab_indices)} onglets disponibles",
+                'elements': [elements[i].element_id for i in tab_indices[:5]]
             })
         
         # Identifier les formulaires
-        form_elements = [elem for elem in session.discovered_elements if elem.element_type == 'forms']
-        if form_elements:
+        form_indices = elements.filter_type('forms')
+        if len(form_indices):
             suggestions.append({
                 'type': 'interact_forms',
-                'description': f"Interagir avec {len(form_elements)} formulaires",
-                'elements': [elem.element_id for elem in form_elements[:3]]
+                'description': f"Interagir avec {len(form_indices)} formulaires",
+                'elements': [elements[i].element_id for i in form_indices[:3]]
             })
         
         # Identifier les liens de navigation importants
-        nav_links = [elem for elem in session.discovered_elements 
-                    if elem.element_type == 'navigation' and elem.interaction_score > 0.6]
-        if nav_links:
+        nav_indices = elements.filter_type('navigation', min_score=0.6)
+        if len(nav_indices):
             suggestions.append({
                 'type': 'follow_navigation',
-                'description': f"Suivre {len(nav_links)} liens de navigation importants",
-                'elements': [elem.element_id for elem in nav_links[:5]]
+                'description': f"Suivre {len(nav_indices)} liens de navigation importants",
+                'elements': [elements[i].element_id for i in nav_indices[:5]]
             })
         
+        session.suggestions_cache = (session.discovered_elements, suggestions)
         return suggestions
     
-    def _take_screenshot(self, filename_prefix: str) -> Optional[str]:
-        """Prend une capture d'écran"""
+    @staticmethod
+    def _carry_over_element_ids(previous_elements: List[InteractiveElement], elements: List[InteractiveElement]):
+        """
+        Sur une même page réanalysée, redonne aux éléments inchangés (même XPath, même type)
+        leur identifiant précédent : ceux déjà communiqués restent utilisables.
+        """
+        previous_ids = {
+            (elem.xpath, elem.element_type): elem.element_id
+            for elem in previous_elements if elem.xpath
+        }
+        for elem in elements:
+            previous_id = previous_ids.pop((elem.xpath, elem.element_type), None)
+            if previous_id is not None:
+                elem.element_id = previous_id
+    
+    @staticmethod
+    def _mark_visited(session: NavigationSession, url: str) -> bool:
+        """Ajoute une URL à l'historique de la session ; False si elle y figurait déjà"""
+        if url in session.visited_urls:
+            return False
+        session.visited_urls[url] = None
+        return True
+    
+    def _wait_for_page_ready(self) -> bool:
+        """Attend document.readyState == 'complete' (au plus page_load_timeout secondes)"""
+        try:
+            self.WebDriverWait(self.webdriver, self.config['page_load_timeout'], poll_frequency=0.05).until(
+                lambda driver: driver.execute_script("return document.readyState") == 'complete'
+            )
+            return True
+        except Exception as e:
+            logger.warning(f"⏱️ Page non chargée complètement: {e.__class__.__name__}")
+            return False
+    
+    def _install_mutation_observer(self):
+        """Installe l'observateur de mutations du DOM sur la page courante (idempotent)"""
+        try:
+            self.webdriver.execute_script(self._INSTALL_MUTATION_OBSERVER_JS)
+        except Exception as e:
+            logger.debug(f"Observateur de mutations non installé: {e}")
+    
+    def _take_mutation_flag(self) -> bool:
+        """Indique si le DOM a muté depuis la dernière lecture (True en cas de doute)"""
+        try:
+            return bool(self.webdriver.execute_script(self._TAKE_MUTATION_FLAG_JS))
+        except Exception:
+            return True
+    
+    def _take_screenshot(self, filename_prefix: str) -> Optional[Future]:
+        """
+        Prend une capture d'écran (capture synchrone, écriture disque en arrière-plan)
+        
+        Returns:
+            Future dont le résultat est le chemin du fichier une fois écrit (None si l'écriture échoue),
+            ou None si la capture n'a pas pu être prise
+        """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"{filename_prefix}_{timestamp}.png"
             screenshot_path = self.screenshots_dir / filename
             
-            self.webdriver.save_screenshot(str(screenshot_path))
-            return str(screenshot_path)
+            png = self.webdriver.get_screenshot_as_png()
+            if self._screenshot_pool is None:
+                self._screenshot_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ax-shot')
+            return self._screenshot_pool.submit(self._write_screenshot, screenshot_path, png)
             
         except Exception as e:
             logger.error(f"❌ Erreur capture d'écran: {e}")
             return None
     
+    @staticmethod
+    def _write_screenshot(screenshot_path: Path, png: bytes) -> Optional[str]:
+        """Écrit une capture d'écran sur disque (exécuté dans le pool d'écriture) ; retourne son chemin"""
+        try:
+            screenshot_path.write_bytes(png)
+            return str(screenshot_path)
+        except OSError as e:
+            logger.error(f"❌ Erreur écriture capture d'écran {screenshot_path}: {e}")
+            return None
+    
     def close_session(self, session_id: str) -> Dict[str, Any]:
         """Ferme une session de navigation"""
-        if session_id not in self.active_sessions:
+        # Retirer la session d'emblée : le rapport ne lit ensuite que des compteurs
+        session = self.active_sessions.pop(session_id, None)
+        if session is None:
             return {'success': False, 'error': 'Session non trouvée'}
         
-        session = self.active_sessions[session_id]
-        
         # Générer un rapport de session
-        session_duration = (datetime.now() - session.session_start_time).total_seconds()
+        session_duration = time.monotonic() - session.session_start_time
         report = {
             'session_id': session_id,
             'duration_seconds': session_duration,
             'pages_visited': len(session.visited_urls),
-            'interactions_performed': len(session.interactions_performed),
-            'successful_interactions': sum(1 for r in session.interactions_performed if r.success),
+            'interactions_performed': session.interaction_count,
+            'successful_interactions': session.successful_interaction_count,
             'elements_discovered': len(session.discovered_elements),
-            'visited_urls': session.visited_urls,
+            'visited_urls': list(session.visited_urls),
             'goals_achieved': []  # À implémenter selon les objectifs
         }
         
-        # Supprimer la session
-        del self.active_sessions[session_id]
-        
         logger.info(f"📊 Session fermée: {session_id} - {report['interactions_performed']} interactions")
         return {'success': True, 'report': report}
     
     def get_statistics(self) -> Dict[str, Any]:
-        """Retourne les statistiques du navigateur interactif"""
+        """
+        Retourne les statistiques du navigateur interactif
+        
+        'stats' est une copie des compteurs courants (sérialisable en JSON) ;
+        'version' ne change que si un compteur a changé : inutile de resérialiser sinon.
+        """
         return {
-            'stats': self.stats,
+            'stats': dict(self.stats),
+            'version': self._stats_version,
             'active_sessions': len(self.active_sessions),
             'config': self.config
         }
     
+    def shutdown(self):
+        """Attend la fin des écritures de captures d'écran en attente et libère le pool (recréé à la capture suivante)"""
+        if self._screenshot_pool is not None:
+            self._screenshot_pool.shutdown(wait=True)
+            self._screenshot_pool = None
+    
     def close(self):
         """Ferme le navigateur et nettoie les ressources"""
+        self.shutdown()
         if self.webdriver:
             try:
                 self.webdriver.quit()
@@ -839,7 +1278,31 @@ def interact_with_web_element(session_id: str, element_id: str,
     """Interagit avec un élément web spécifique"""
     navigator = get_interactive_navigator()
     result = navigator.interact_with_element(session_id, element_id, action)
+    return _interaction_result_to_dict(result)
+
+def interact_with_web_elements(session_id: str, actions: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    """
+    Enchaîne plusieurs interactions dans la même session, en un seul appel
     
+    Args:
+        session_id: Identifiant de la session
+        actions: Liste de {'element_id': ..., 'action': 'click' | 'hover'} (action par défaut : click)
+        
+    Returns:
+        Un résultat par action, au format de interact_with_web_element. Les identifiants
+        d'éléments changent après un changement de page : les actions suivantes
+        échouent alors avec « Élément non trouvé ».
+    """
+    navigator = get_interactive_navigator()
+    return [
+        _interaction_result_to_dict(
+            navigator.interact_with_element(session_id, item['element_id'], item.get('action', 'click'))
+        )
+        for item in actions
+    ]
+
+def _interaction_result_to_dict(result: InteractionResult) -> Dict[str, Any]:
+    """Forme sérialisable d'un InteractionResult pour l'API Gemini"""
     return {
         'success': result.success,
         'action_performed': result.action_performed,
@@ -847,7 +1310,7 @@ def interact_with_web_element(session_id: str, element_id: str,
         'new_url': result.new_url,
         'error_message': result.error_message,
         'execution_time': result.execution_time,
-        'element_text': result.element.text if result.element else None
+        'element_text': result.element_text
     }
 
 def get_page_interactive_elements(session_id: str) -> Dict[str, Any]:
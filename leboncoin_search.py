@@ -4,144 +4,356 @@ Module spécialisé pour la recherche d'appartements sur Leboncoin
 Permet à l'IA d'obtenir de vrais liens vers des annonces d'appartements
 """
 
+import os
+import json
+import sqlite3
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import time
 import logging
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple
 from urllib.parse import urlencode, quote
 from datetime import datetime
 
+try:
+    from lxml import html as lxml_html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class CitySearch:
+    """Recherche Leboncoin d'une zone, avec le nombre d'annonces à en retenir"""
+    name: str
+    url: str
+    max_listings: int = 5
+
+# En-têtes HTTP communs à toutes les requêtes (construits une fois, à l'import)
+_DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'fr-FR,fr;q=0.9',
+    # N'annoncer que les compressions que urllib3 sait décoder (br seulement si brotli est installé)
+    'Accept-Encoding': requests.utils.DEFAULT_ACCEPT_ENCODING,
+    'DNT': '1',
+    'Connection': 'keep-alive'
+}
+
+# Cache disque par défaut : sous data/ à côté du module, quel que soit le répertoire courant
+_DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'leboncoin', 'leboncoin_cache.db')
+
+# Recherches pour différentes villes des Hauts-de-France (construites une fois, à l'import)
+_HDF_SEARCHES = (
+    CitySearch("Hauts-de-France", "https://www.leboncoin.fr/recherche?category=9&regions=6&real_estate_type=2"),
+    CitySearch("Lille", "https://www.leboncoin.fr/recherche?category=9&locations=Lille_59000__45.48324_2.93576_5565&real_estate_type=2"),
+    CitySearch("Amiens", "https://www.leboncoin.fr/recherche?category=9&locations=Amiens_80000__49.89427_2.29576_5565&real_estate_type=2"),
+    CitySearch("Roubaix", "https://www.leboncoin.fr/recherche?category=9&locations=Roubaix_59100__50.69421_3.17456_5565&real_estate_type=2"),
+    CitySearch("Tourcoing", "https://www.leboncoin.fr/recherche?category=9&locations=Tourcoing_59200__50.72429_3.15789_5565&real_estate_type=2")
+)
+
 class LeboncoinSearcher:
     """Recherche spécialisée d'appartements sur Leboncoin"""
     
-    def __init__(self):
+    # Expressions compilées une fois pour toutes
+    # Liens d'annonces, relatifs ou absolus, en une seule passe sur la page
+    # (motif binaire : appliqué à la page de recherche non décodée, seuls les liens trouvés sont décodés)
+    _LINK_RE = re.compile(rb'href="((?:/|https://www\.leboncoin\.fr/)ad/[^"]+)"', re.IGNORECASE)
+    _TITLE_RE = re.compile(r'<title[^>]*>([^<]+)</title>')
+    # Montant collé au « € » qui le suit (« 1 250 € ») : répétitions bornées, et motif appliqué
+    # seulement aux _PRICE_WINDOW caractères qui précèdent chaque « € » (voir _search_price),
+    # jamais à une longue suite de chiffres sans « € » (identifiants, horodatages)
+    # Une suite de chiffres plus longue que le motif (ou que la fenêtre) ne correspond pas : pas de montant tronqué
+    _PRICE_RE = re.compile(r'(?<!\d)(\d{1,9}(?:\s\d{3}){0,3})\s{0,3}€$')
+    _PRICE_WINDOW = 32
+    _LOCATION_RES = (
+        re.compile(r'<span[^>]*data-qa-id="adview_location_informations"[^>]*>([^<]+)</span>'),
+        re.compile(r'Ville\s*:\s*([^<\n]+)')
+    )
+    # Données de l'annonce embarquées par Next.js (JSON déjà structuré)
+    _NEXT_DATA_RE = re.compile(r'<script[^>]*\bid="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+    
+    # Lecture partielle des fiches d'annonces (voir _fetch_listing)
+    _LISTING_CHUNK_SIZE = 64 * 1024
+    _LISTING_MAX_BYTES = 256 * 1024
+    
+    def __init__(self, max_workers: int = 8, min_request_interval: float = 0.25,
+                 listing_cache_ttl: float = 600, listing_cache_size: int = 2048,
+                 cache_path: Optional[str] = _DEFAULT_CACHE_PATH, search_cache_ttl: float = 300):
+        # Requêtes lancées en parallèle, mais jamais plus d'un départ par min_request_interval (respect du site)
+        self.max_workers = max_workers
+        self.min_request_interval = min_request_interval
+        self._throttle_lock = threading.Lock()
+        self._next_request_time = 0.0
+        
+        # Fiches déjà extraites, par URL (LRU borné, entrées expirées après listing_cache_ttl secondes).
+        # Lu et écrit uniquement par le fil qui pilote la recherche.
+        self.listing_cache_ttl = listing_cache_ttl
+        self.listing_cache_size = listing_cache_size
+        self._listing_cache: 'OrderedDict[str, Tuple[float, Dict[str, Any]]]' = OrderedDict()
+        
+        # Cache disque (SQLite en mode WAL) partagé entre les exécutions : pages de recherche
+        # (search_cache_ttl) et fiches extraites (listing_cache_ttl). None le désactive.
+        # Ouvert à la première utilisation ; une seule connexion, protégée par un verrou.
+        self.cache_path = cache_path
+        self.search_cache_ttl = search_cache_ttl
+        self._cache_db: Optional[sqlite3.Connection] = None
+        self._cache_db_lock = threading.Lock()
+        
         self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'fr-FR,fr;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive'
-        })
+        self.session.headers.update(_DEFAULT_HEADERS)
+        # Un seul hôte, une connexion persistante par worker : pas de poignée de main TLS répétée ;
+        # les erreurs de connexion passagères sont retentées deux fois avant d'abandonner l'URL
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_workers,
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
     def search_apartments_hauts_de_france(self, max_results: int = 10) -> List[Dict[str, Any]]:
         """Recherche des appartements dans les Hauts-de-France"""
         
         logger.info("🔍 Recherche d'appartements dans les Hauts-de-France sur Leboncoin")
         
-        # URLs de recherche pour différentes villes des Hauts-de-France
-        search_urls = [
-            "https://www.leboncoin.fr/recherche?category=9&regions=6&real_estate_type=2",  # Appartements Hauts-de-France
-            "https://www.leboncoin.fr/recherche?category=9&locations=Lille_59000__45.48324_2.93576_5565&real_estate_type=2",  # Lille
-            "https://www.leboncoin.fr/recherche?category=9&locations=Amiens_80000__49.89427_2.29576_5565&real_estate_type=2",  # Amiens
-            "https://www.leboncoin.fr/recherche?category=9&locations=Roubaix_59100__50.69421_3.17456_5565&real_estate_type=2",  # Roubaix
-            "https://www.leboncoin.fr/recherche?category=9&locations=Tourcoing_59200__50.72429_3.15789_5565&real_estate_type=2"  # Tourcoing
-        ]
+        # Pages de recherche et fiches d'annonces partagent le même pool ;
+        # les annonces sont rangées par (ville, rang) pour garder l'ordre séquentiel d'origine
+        found: Dict[tuple, Dict[str, Any]] = {}
+        scheduled_links = set()  # Une annonce présente dans plusieurs recherches n'est traitée qu'une fois
         
-        all_apartments = []
-        
-        for search_url in search_urls:
-            try:
-                logger.info(f"Recherche sur: {search_url}")
-                
-                response = self.session.get(search_url, timeout=10)
-                response.raise_for_status()
-                
-                # Extraire les liens d'annonces
-                apartment_links = self._extract_apartment_links(response.text)
-                
-                for link in apartment_links[:5]:  # 5 par ville max
-                    apartment_info = self._get_apartment_info(link)
-                    if apartment_info:
-                        all_apartments.append(apartment_info)
-                        
-                        if len(all_apartments) >= max_results:
-                            break
-                
-                time.sleep(1)  # Respect du site
-                
-                if len(all_apartments) >= max_results:
-                    break
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = {}
+            for city_index, city in enumerate(_HDF_SEARCHES):
+                logger.info(f"Recherche sur: {city.url}")
+                pending[executor.submit(self._fetch, city.url)] = (None, city_index, city.url)
+            
+            while pending and len(found) < max_results:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    rank, city_index, url = pending.pop(future)
                     
-            except Exception as e:
-                logger.error(f"Erreur lors de la recherche sur {search_url}: {str(e)}")
-                continue
+                    if rank is not None:
+                        apartment_info = future.result()
+                        if apartment_info:
+                            found[(city_index, rank)] = apartment_info
+                            self._store_cached_listing(url, apartment_info)
+                        continue
+                    
+                    try:
+                        html_content = future.result()
+                    except Exception as e:
+                        logger.error(f"Erreur lors de la recherche sur {url}: {str(e)}")
+                        continue
+                    
+                    # Extraire les liens d'annonces
+                    apartment_links = self._extract_apartment_links(
+                        html_content, limit=_HDF_SEARCHES[city_index].max_listings, exclude=scheduled_links
+                    )
+                    for rank, link in enumerate(apartment_links):
+                        scheduled_links.add(link)
+                        cached = self._get_cached_listing(link)
+                        if cached:
+                            found[(city_index, rank)] = cached
+                        else:
+                            pending[executor.submit(self._get_apartment_info, link)] = (rank, city_index, link)
+            
+            # Assez de résultats : abandonner les requêtes pas encore démarrées
+            for future in pending:
+                future.cancel()
+        
+        all_apartments = [self._to_result(found[key]) for key in sorted(found)[:max_results]]
         
         logger.info(f"✅ {len(all_apartments)} appartements trouvés")
         return all_apartments
     
-    def _extract_apartment_links(self, html_content: str) -> List[str]:
-        """Extrait les liens vers les annonces d'appartements"""
-        links = []
-        
-        # Patterns pour les liens d'annonces Leboncoin
-        patterns = [
-            r'href="(/ad/[^"]+)"',
-            r'href="(https://www\.leboncoin\.fr/ad/[^"]+)"'
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, html_content, re.IGNORECASE)
-            for match in matches:
-                if match.startswith('/'):
-                    full_url = f"https://www.leboncoin.fr{match}"
-                else:
-                    full_url = match
-                
-                if full_url not in links:
-                    links.append(full_url)
-        
-        return links[:20]  # Limiter à 20 liens
+    @staticmethod
+    def _to_result(apartment_info: Dict[str, Any]) -> Dict[str, Any]:
+        """Annonce telle que renvoyée : l'horodatage ISO n'est formaté que pour les résultats retenus"""
+        result = dict(apartment_info)
+        result["found_at"] = datetime.fromtimestamp(result.pop("found_at_ns") / 1e9).isoformat()
+        return result
+    
+    def _get_cached_listing(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fiche déjà extraite pour cette URL (copie), si elle n'a pas expiré"""
+        entry = self._listing_cache.get(url)
+        if entry is None:
+            # Fiche extraite lors d'une exécution précédente ?
+            cached = self._read_disk_cache('listing', url, self.listing_cache_ttl)
+            if cached is None:
+                return None
+            age, body = cached
+            entry = (time.monotonic() - age, json.loads(body))
+            self._listing_cache[url] = entry
+        stored_at, apartment_info = entry
+        if time.monotonic() - stored_at > self.listing_cache_ttl:
+            del self._listing_cache[url]
+            return None
+        self._listing_cache.move_to_end(url)
+        return dict(apartment_info)
+    
+    def _store_cached_listing(self, url: str, apartment_info: Dict[str, Any]):
+        """Mémorise une fiche extraite (évince la moins récemment utilisée au-delà de listing_cache_size)"""
+        self._listing_cache[url] = (time.monotonic(), dict(apartment_info))
+        self._listing_cache.move_to_end(url)
+        while len(self._listing_cache) > self.listing_cache_size:
+            self._listing_cache.popitem(last=False)
+        self._write_disk_cache('listing', url, json.dumps(apartment_info, ensure_ascii=False).encode('utf-8'))
+    
+    def _disk_cache(self) -> Optional[sqlite3.Connection]:
+        """Connexion au cache disque, ouverte au premier appel (None si désactivé ou inutilisable)"""
+        if self._cache_db is None and self.cache_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+                conn = sqlite3.connect(self.cache_path, timeout=20.0, check_same_thread=False)
+                # WAL : les lectures d'un autre processus ne bloquent pas les écritures
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute('PRAGMA synchronous=NORMAL')
+                conn.execute('''
+                CREATE TABLE IF NOT EXISTS http_cache (
+                    kind TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    body BLOB NOT NULL,
+                    PRIMARY KEY (kind, url)
+                )
+                ''')
+                # Purger ce qui a expiré pour les deux usages
+                conn.execute('DELETE FROM http_cache WHERE stored_at < ?',
+                             (time.time() - max(self.search_cache_ttl, self.listing_cache_ttl),))
+                conn.commit()
+                self._cache_db = conn
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"⚠️ Cache SQLite indisponible ({self.cache_path}): {str(e)}")
+                self.cache_path = None
+        return self._cache_db
+    
+    def _read_disk_cache(self, kind: str, url: str, ttl: float) -> Optional[Tuple[float, bytes]]:
+        """(âge en secondes, contenu) d'une entrée du cache disque, si elle n'a pas expiré"""
+        with self._cache_db_lock:
+            conn = self._disk_cache()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute('SELECT stored_at, body FROM http_cache WHERE kind = ? AND url = ?',
+                                   (kind, url)).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"Lecture du cache SQLite impossible pour {url}: {str(e)}")
+                return None
+        if row is None:
+            return None
+        age = time.time() - row[0]
+        return (age, bytes(row[1])) if age <= ttl else None
+    
+    def _write_disk_cache(self, kind: str, url: str, body: bytes):
+        """Enregistre une entrée dans le cache disque (les erreurs SQLite ne font pas échouer la recherche)"""
+        with self._cache_db_lock:
+            conn = self._disk_cache()
+            if conn is None:
+                return
+            try:
+                conn.execute('INSERT OR REPLACE INTO http_cache (kind, url, stored_at, body) VALUES (?, ?, ?, ?)',
+                             (kind, url, time.time(), sqlite3.Binary(body)))
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.debug(f"Écriture du cache SQLite impossible pour {url}: {str(e)}")
+    
+    def _throttle(self):
+        """Attend son tour : les départs de requêtes sont espacés de min_request_interval"""
+        with self._throttle_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_time)
+            self._next_request_time = start_at + self.min_request_interval
+        if start_at > now:
+            time.sleep(start_at - now)
+    
+    def _fetch(self, url: str) -> bytes:
+        """Télécharge une page, décompressée mais non décodée (appelé depuis le pool)"""
+        cached = self._read_disk_cache('search', url, self.search_cache_ttl)
+        if cached is not None:
+            return cached[1]
+        self._throttle()
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        self._write_disk_cache('search', url, response.content)
+        return response.content
+    
+    def _fetch_listing(self, url: str) -> str:
+        """
+        Télécharge le début d'une fiche d'annonce
+        
+        La lecture s'arrête dès que titre, prix et localisation sont arrivés
+        (ou après _LISTING_MAX_BYTES) : le reste de la page n'est pas transféré.
+        """
+        self._throttle()
+        with self.session.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            buffer = bytearray()
+            for chunk in response.iter_content(chunk_size=self._LISTING_CHUNK_SIZE):
+                buffer.extend(chunk)
+                if len(buffer) >= self._LISTING_MAX_BYTES or self._listing_fields_received(buffer):
+                    break
+            encoding = response.encoding or 'utf-8'
+        return buffer.decode(encoding, errors='replace')
+    
+    @staticmethod
+    def _listing_fields_received(buffer: bytearray) -> bool:
+        """Indique si le tampon contient déjà le bloc __NEXT_DATA__ complet, ou le titre, un prix et la localisation"""
+        next_data = buffer.find(b'id="__NEXT_DATA__"')
+        if next_data != -1 and buffer.find(b'</script>', next_data) != -1:
+            return True
+        location = buffer.find(b'adview_location_informations')
+        return (
+            location != -1
+            and buffer.find(b'</span>', location) != -1
+            and b'</title>' in buffer
+            and '€'.encode() in buffer
+        )
+    
+    def _extract_apartment_links(self, html_content: bytes, limit: int = 20,
+                                 exclude: Optional[set] = None) -> List[str]:
+        """
+        Extrait les liens vers les annonces d'appartements
+        
+        Le parcours de la page s'arrête dès que limit liens nouveaux (absents de exclude) sont trouvés.
+        """
+        links: Dict[str, None] = {}  # Ensemble ordonné : ordre d'apparition conservé
+        for match in self._LINK_RE.finditer(html_content):
+            href = match.group(1).decode('utf-8', 'replace')
+            full_url = f"https://www.leboncoin.fr{href}" if href.startswith('/') else href
+            if full_url in links or (exclude and full_url in exclude):
+                continue
+            links[full_url] = None
+            if len(links) >= limit:
+                break
+        
+        return list(links)
     
     def _get_apartment_info(self, apartment_url: str) -> Dict[str, Any]:
         """Récupère les informations d'un appartement"""
         
         try:
-            response = self.session.get(apartment_url, timeout=10)
-            response.raise_for_status()
-            
-            content = response.text
-            
-            # Extraire le titre
-            title_match = re.search(r'<title[^>]*>([^<]+)</title>', content)
-            title = title_match.group(1).strip() if title_match else "Appartement"
-            
-            # Extraire le prix
-            price_patterns = [
-                r'(\d+(?:\s?\d+)*)\s*€',
-                r'Prix\s*:\s*(\d+(?:\s?\d+)*)\s*€'
-            ]
-            
-            price = "Prix non spécifié"
-            for pattern in price_patterns:
-                price_match = re.search(pattern, content)
-                if price_match:
-                    price = f"{price_match.group(1)} €"
-                    break
+            content = self._fetch_listing(apartment_url)
             
-            # Extraire la localisation
-            location_patterns = [
-                r'<span[^>]*data-qa-id="adview_location_informations"[^>]*>([^<]+)</span>',
-                r'Ville\s*:\s*([^<\n]+)'
-            ]
-            
-            location = "Localisation non spécifiée"
-            for pattern in location_patterns:
-                location_match = re.search(pattern, content)
-                if location_match:
-                    location = location_match.group(1).strip()
-                    break
+            fields = self._extract_fields_next_data(content)
+            if fields is None and LXML_AVAILABLE:
+                fields = self._extract_fields_lxml(content)
+            if fields is None:
+                fields = self._extract_fields_regex(content)
+            title, price, location = fields
             
             return {
                 "url": apartment_url,
                 "title": title,
                 "price": price,
                 "location": location,
-                "found_at": datetime.now().isoformat(),
+                "found_at_ns": time.time_ns(),
                 "source": "leboncoin"
             }
             
@@ -149,6 +361,101 @@ class LeboncoinSearcher:
             logger.error(f"Erreur lors de l'extraction des infos pour {apartment_url}: {str(e)}")
             return None
 
+    def _extract_fields_next_data(self, content: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Titre, prix et localisation lus dans le bloc JSON __NEXT_DATA__ de la fiche
+        
+        None si le bloc est absent (ou tronqué par la lecture partielle) ou incomplet.
+        """
+        blob_match = self._NEXT_DATA_RE.search(content)
+        if not blob_match:
+            return None
+        
+        try:
+            ad = json.loads(blob_match.group(1))['props']['pageProps']['ad']
+            title = (ad.get('subject') or '').strip()
+            prices = ad.get('price') or []
+            location_data = ad.get('location') or {}
+            location = ' '.join(filter(None, (location_data.get('city'), location_data.get('zipcode'))))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.debug(f"Bloc __NEXT_DATA__ inexploitable: {e}")
+            return None
+        
+        if not (title and prices and location):
+            return None
+        
+        # Même présentation que le prix affiché sur la page (« 1 250 € »)
+        price = f"{prices[0]:,} €".replace(',', ' ') if isinstance(prices[0], int) else f"{prices[0]} €"
+        return title, price, location
+    
+    @classmethod
+    def _search_price(cls, text: str) -> Optional[str]:
+        """
+        Premier montant suivi de « € » dans le texte, ou None
+        
+        Chaque « € » est repéré par str.find ; le montant est lu à rebours dans une fenêtre
+        bornée : coût proportionnel au nombre de « € », quel que soit le reste du texte.
+        """
+        end = text.find('€')
+        while end != -1:
+            match = cls._PRICE_RE.search(text, max(0, end - cls._PRICE_WINDOW), end + 1)
+            if match:
+                return match.group(1)
+            end = text.find('€', end + 1)
+        return None
+    
+    def _extract_fields_regex(self, content: str) -> Tuple[str, str, str]:
+        """Titre, prix et localisation extraits par expressions régulières sur la page entière"""
+        # Extraire le titre
+        title_match = self._TITLE_RE.search(content)
+        title = title_match.group(1).strip() if title_match else "Appartement"
+        
+        # Extraire le prix
+        amount = self._search_price(content)
+        price = f"{amount} €" if amount else "Prix non spécifié"
+        
+        # Extraire la localisation
+        location = "Localisation non spécifiée"
+        for pattern in self._LOCATION_RES:
+            location_match = pattern.search(content)
+            if location_match:
+                location = location_match.group(1).strip()
+                break
+        
+        return title, price, location
+    
+    def _extract_fields_lxml(self, content: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Titre, prix et localisation lus dans l'arbre lxml (une seule analyse, en C)
+        
+        Le prix est cherché dans le seul nœud de prix ; chaque champ absent de l'arbre
+        retombe sur l'expression régulière correspondante. None si la page ne s'analyse pas.
+        """
+        try:
+            document = lxml_html.fromstring(content)
+        except Exception as e:
+            logger.debug(f"Analyse lxml impossible, repli sur les expressions régulières: {e}")
+            return None
+        
+        title = (document.findtext('.//title') or '').strip()
+        if not title:
+            title_match = self._TITLE_RE.search(content)
+            title = title_match.group(1).strip() if title_match else "Appartement"
+        
+        price_nodes = document.xpath('//*[contains(@data-qa-id, "price")]')
+        amount = self._search_price(price_nodes[0].text_content()) if price_nodes else None
+        if amount is None:
+            amount = self._search_price(content)
+        price = f"{amount} €" if amount else "Prix non spécifié"
+        
+        location_nodes = document.xpath('//*[@data-qa-id="adview_location_informations"]')
+        location = location_nodes[0].text_content().strip() if location_nodes else ''
+        if not location:
+            location_match = self._LOCATION_RES[-1].search(content)
+            location = location_match.group(1).strip() if location_match else "Localisation non spécifiée"
+        
+        return title, price, location
+
 # Instance globale
 leboncoin_searcher = LeboncoinSearcher()
 
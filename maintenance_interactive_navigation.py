@@ -6,26 +6,180 @@ Valide, maintient et optimise le système complet
 
 import os
 import sys
+import ast
 import json
 import time
+import queue
 import shutil
 import logging
+import logging.handlers
 import subprocess
+from importlib.util import find_spec
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Set
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('maintenance.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger('InteractiveNavigationMaintenance')
 
+def _setup_logging() -> Optional[logging.handlers.QueueListener]:
+    """
+    Configure le logging du script (appelé par main, jamais à l'import)
+    
+    Les appels ne font que déposer l'enregistrement dans une file ; un fil d'arrière-plan
+    (QueueListener) se charge des écritures dans maintenance.log et sur la console.
+    Comme basicConfig, sans effet si le logging est déjà configuré : retourne alors None,
+    sinon le listener à arrêter en fin d'exécution.
+    """
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return None
+        
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler('maintenance.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+        
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return listener
+
+# Sérialisation JSON rapide si orjson est disponible (même format indenté)
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Validation des configurations JSON en flux si ijson est disponible (aucun objet construit)
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    _JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    _JSON_ERRORS = (json.JSONDecodeError,)
+
+def _validate_json_file(path: Path):
+    """Lève une des _JSON_ERRORS si le fichier n'est pas du JSON valide"""
+    if IJSON_AVAILABLE:
+        with open(path, 'rb') as f:
+            for _ in ijson.parse(f):
+                pass
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            json.load(f)
+
+# Module importable de chaque paquet pip dont le nom diffère (les autres : tirets remplacés par des soulignés)
+_PKG_TO_MODULE = {
+    'google-generativeai': 'google.generativeai',
+    'beautifulsoup4': 'bs4',
+    'pillow': 'PIL',
+    'python-dotenv': 'dotenv'
+}
+
+def _package_available(package: str) -> bool:
+    """Le module du paquet est-il trouvable ? (localisé sur sys.path, sans exécuter son code)"""
+    try:
+        return find_spec(_PKG_TO_MODULE.get(package, package.replace('-', '_'))) is not None
+    except (ImportError, ValueError):
+        # Paquet parent absent (ex. google pour google.generativeai)
+        return False
+
+# Niveau et icône de journalisation par statut d'action de maintenance
+_LOG_LEVELS = {
+    "SUCCESS": (logging.INFO, "✅"),
+    "INFO": (logging.INFO, "🔍"),
+    "WARNING": (logging.WARNING, "⚠️"),
+    "ERROR": (logging.ERROR, "❌")
+}
+
+def _check_one_file(full_path: str, file_path: str,
+                    known_signature: Optional[List[int]] = None) -> Tuple[str, str, Optional[str], Optional[List[int]]]:
+    """
+    Vérifie un fichier critique (existence, taille, syntaxe Python)
+    
+    Retourne (fichier, statut, erreur, signature) avec statut parmi MISSING, EMPTY, SYNTAX_ERROR,
+    SYNTAX_OK et OK. La signature [mtime_ns, taille] permet de ne pas réanalyser un fichier
+    inchangé depuis sa dernière vérification réussie (known_signature).
+    """
+    path = Path(full_path)
+    
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return file_path, "MISSING", None, None
+    signature = [stat.st_mtime_ns, stat.st_size]
+        
+    # Vérification de la taille (fichier non vide)
+    if stat.st_size == 0:
+        return file_path, "EMPTY", None, None
+        
+    if file_path.endswith('.py') and signature == known_signature:
+        return file_path, "SYNTAX_OK", None, signature
+        
+    # Vérification de la syntaxe Python (analyse seule, sans génération de bytecode ;
+    # les octets bruts laissent l'analyseur appliquer la déclaration d'encodage du fichier)
+    if file_path.endswith('.py'):
+        try:
+            ast.parse(path.read_bytes(), filename=file_path, mode='exec')
+        except SyntaxError as e:
+            return file_path, "SYNTAX_ERROR", str(e), None
+        return file_path, "SYNTAX_OK", None, signature
+        
+    return file_path, "OK", None, None
+
+def _safe_delete(entry: os.DirEntry) -> Tuple[str, bool, Optional[str]]:
+    """Supprime un fichier ou un dossier temporaire ; retourne (chemin, succès, erreur)"""
+    try:
+        if entry.is_dir(follow_symlinks=False):
+            shutil.rmtree(entry.path)
+        else:
+            os.unlink(entry.path)
+        return entry.path, True, None
+    except Exception as e:
+        return entry.path, False, str(e)
+
+def _iter_cleanup_targets(root: str):
+    """
+    Parcourt l'arborescence une seule fois et produit les entrées temporaires à supprimer
+    
+    Équivaut aux motifs **/*.pyc, **/__pycache__, **/.pytest_cache, **/cache/*,
+    **/test_results_*/*.png et **/logs/*.log.old. Les entrées produites sont des os.DirEntry ;
+    on ne descend ni dans les dossiers à supprimer ni dans les liens symboliques.
+    """
+    pending = [(root, '')]  # (dossier, nom du dossier ; vide pour la racine, qui n'est jamais un parent ciblé)
+    while pending:
+        directory, directory_name = pending.pop()
+        in_cache = directory_name == 'cache'
+        in_test_results = directory_name.startswith('test_results_')
+        in_logs = directory_name == 'logs'
+        
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+            
+        for entry in entries:
+            name = entry.name
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if in_cache or (is_dir and name in ('__pycache__', '.pytest_cache')):
+                yield entry
+            elif is_dir:
+                pending.append((entry.path, name))
+            elif (name.endswith('.pyc')
+                  or (in_test_results and name.endswith('.png'))
+                  or (in_logs and name.endswith('.log.old'))):
+                yield entry
+
 class InteractiveNavigationMaintainer:
     """Système de maintenance pour la navigation interactive"""
     
@@ -36,6 +190,13 @@ class InteractiveNavigationMaintainer:
         self.fixes_applied = []
         self.start_time = datetime.now()
         
+        # Fichiers critiques absents, relevés par check_file_integrity (None tant qu'elle n'a pas tourné)
+        self._missing_files: Optional[Set[str]] = None
+        
+        # Signatures [mtime_ns, taille] des fichiers dont la syntaxe a déjà été validée
+        self.syntax_cache_file = self.project_root / '.maintenance_cache.json'
+        self.syntax_cache = self._load_syntax_cache()
+        
         # Fichiers critiques du système
         self.critical_files = [
             'interactive_web_navigator.py',
@@ -72,12 +233,26 @@ class InteractiveNavigationMaintainer:
         
         self.maintenance_log.append(entry)
         
-        if status == "SUCCESS":
-            logger.info(f"✅ {action}: {details}")
-        elif status == "WARNING":
-            logger.warning(f"⚠️ {action}: {details}")
-        else:
-            logger.error(f"❌ {action}: {details}")
+        # Message interpolé par le logging seulement s'il est émis
+        level, icon = _LOG_LEVELS.get(status, _LOG_LEVELS["ERROR"])
+        logger.log(level, "%s %s: %s", icon, action, details)
+            
+    def _load_syntax_cache(self) -> Dict[str, List[int]]:
+        """Charge le cache des vérifications de syntaxe (vide s'il est absent ou illisible)"""
+        try:
+            with open(self.syntax_cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, ValueError):
+            return {}
+            
+    def _save_syntax_cache(self):
+        """Sauvegarde le cache des vérifications de syntaxe"""
+        try:
+            with open(self.syntax_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self.syntax_cache, f, separators=(',', ':'))
+        except OSError as e:
+            logger.warning("⚠️ Cache de syntaxe non sauvegardé: %s", e)
             
     def check_file_integrity(self) -> bool:
         """Vérifie l'intégrité des fichiers critiques"""
@@ -85,35 +260,40 @@ class InteractiveNavigationMaintainer:
         
         all_files_ok = True
         
-        for file_path in self.critical_files:
-            full_path = self.project_root / file_path
-            
-            if not full_path.exists():
+        full_paths = [str(self.project_root / file_path) for file_path in self.critical_files]
+        known_signatures = [self.syntax_cache.get(file_path) for file_path in self.critical_files]
+        
+        results = list(map(_check_one_file, full_paths, self.critical_files, known_signatures))
+        self._missing_files = {file_path for file_path, status, _, _ in results if status == "MISSING"}
+        for file_path, status, error, signature in results:
+            if signature is not None:
+                self.syntax_cache[file_path] = signature
+            else:
+                self.syntax_cache.pop(file_path, None)
+                
+            if status == "MISSING":
                 self.log_action("FILE_MISSING", "ERROR", f"Fichier manquant: {file_path}")
                 self.issues_found.append(f"Fichier manquant: {file_path}")
                 all_files_ok = False
-                continue
-                
-            # Vérification de la taille (fichier non vide)
-            if full_path.stat().st_size == 0:
+            elif status == "EMPTY":
                 self.log_action("FILE_EMPTY", "ERROR", f"Fichier vide: {file_path}")
                 self.issues_found.append(f"Fichier vide: {file_path}")
                 all_files_ok = False
-                continue
-                
-            # Vérification de la syntaxe Python
-            if file_path.endswith('.py'):
-                try:
-                    with open(full_path, 'r', encoding='utf-8') as f:
-                        compile(f.read(), file_path, 'exec')
-                    self.log_action("SYNTAX_CHECK", "SUCCESS", f"Syntaxe valide: {file_path}")
-                except SyntaxError as e:
-                    self.log_action("SYNTAX_ERROR", "ERROR", f"Erreur syntaxe {file_path}: {e}")
-                    self.issues_found.append(f"Erreur syntaxe {file_path}: {e}")
-                    all_files_ok = False
+            elif status == "SYNTAX_ERROR":
+                self.log_action("SYNTAX_ERROR", "ERROR", f"Erreur syntaxe {file_path}: {error}")
+                self.issues_found.append(f"Erreur syntaxe {file_path}: {error}")
+                all_files_ok = False
+            elif status == "SYNTAX_OK":
+                self.log_action("SYNTAX_CHECK", "SUCCESS", f"Syntaxe valide: {file_path}")
                     
         return all_files_ok
         
+    def _get_missing_files(self) -> List[str]:
+        """Fichiers critiques absents, dans l'ordre de critical_files (relevé de check_file_integrity réutilisé)"""
+        if self._missing_files is None:
+            return [f for f in self.critical_files if not (self.project_root / f).exists()]
+        return [f for f in self.critical_files if f in self._missing_files]
+        
     def check_dependencies(self) -> bool:
         """Vérifie les dépendances Python"""
         self.log_action("DEPENDENCY_CHECK", "INFO", "Vérification des dépendances")
@@ -121,10 +301,9 @@ class InteractiveNavigationMaintainer:
         missing_packages = []
         
         for package in self.required_packages:
-            try:
-                __import__(package.replace('-', '_'))
+            if _package_available(package):
                 self.log_action("PACKAGE_OK", "SUCCESS", f"Package disponible: {package}")
-            except ImportError:
+            else:
                 self.log_action("PACKAGE_MISSING", "WARNING", f"Package manquant: {package}")
                 missing_packages.append(package)
                 
@@ -156,10 +335,9 @@ class InteractiveNavigationMaintainer:
             # Vérification spécifique selon le type
             if config_file.endswith('.json'):
                 try:
-                    with open(config_path, 'r', encoding='utf-8') as f:
-                        json.load(f)
+                    _validate_json_file(config_path)
                     self.log_action("CONFIG_VALID", "SUCCESS", f"Configuration valide: {config_file}")
-                except json.JSONDecodeError as e:
+                except _JSON_ERRORS as e:
                     self.log_action("CONFIG_INVALID", "ERROR", f"JSON invalide {config_file}: {e}")
                     self.issues_found.append(f"JSON invalide {config_file}: {e}")
                     config_ok = False
@@ -205,28 +383,22 @@ class InteractiveNavigationMaintainer:
         """Nettoie les fichiers temporaires"""
         self.log_action("CLEANUP", "INFO", "Nettoyage des fichiers temporaires")
         
-        temp_patterns = [
-            '**/*.pyc',
-            '**/__pycache__',
-            '**/test_results_*/*.png',
-            '**/logs/*.log.old',
-            '**/cache/*',
-            '**/.pytest_cache'
-        ]
-        
         cleaned_count = 0
         
-        for pattern in temp_patterns:
-            for file_path in self.project_root.glob(pattern):
-                try:
-                    if file_path.is_file():
-                        file_path.unlink()
-                        cleaned_count += 1
-                    elif file_path.is_dir():
-                        shutil.rmtree(file_path)
-                        cleaned_count += 1
-                except Exception as e:
-                    self.log_action("CLEANUP_ERROR", "WARNING", f"Erreur nettoyage {file_path}: {e}")
+        # Un seul parcours de l'arborescence pour tous les motifs (voir _iter_cleanup_targets)
+        targets = list(_iter_cleanup_targets(str(self.project_root)))
+        
+        # unlink/rmtree libèrent le GIL : les suppressions se recouvrent dans un pool de threads
+        results = []
+        if targets:
+            with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+                results = list(executor.map(_safe_delete, targets))
+                
+        for path, deleted, error in results:
+            if deleted:
+                cleaned_count += 1
+            else:
+                self.log_action("CLEANUP_ERROR", "WARNING", f"Erreur nettoyage {path}: {error}")
                     
         self.log_action("CLEANUP_COMPLETE", "SUCCESS", f"Nettoyage terminé: {cleaned_count} éléments supprimés")
         self.fixes_applied.append(f"Nettoyage: {cleaned_count} fichiers temporaires supprimés")
@@ -245,15 +417,12 @@ class InteractiveNavigationMaintainer:
                 continue
                 
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    
-                # Vérification des imports inutilisés (basique)
-                lines = content.split('\n')
-                import_lines = [line for line in lines if line.strip().startswith('import ') or line.strip().startswith('from ')]
+                # Imports de premier niveau comptés sur l'arbre syntaxique (ignore commentaires et chaînes)
+                tree = ast.parse(py_file.read_bytes(), filename=py_file.name)
+                import_count = sum(1 for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
                 
-                if len(import_lines) > 20:  # Beaucoup d'imports
-                    self.log_action("MANY_IMPORTS", "WARNING", f"Beaucoup d'imports dans {py_file.name}: {len(import_lines)}")
+                if import_count > 20:  # Beaucoup d'imports
+                    self.log_action("MANY_IMPORTS", "WARNING", f"Beaucoup d'imports dans {py_file.name}: {import_count}")
                     
                 optimized_count += 1
                 
@@ -271,9 +440,7 @@ class InteractiveNavigationMaintainer:
             # Génération d'un rapport de maintenance
             maintenance_report = {
                 "last_maintenance": datetime.now().isoformat(),
-                "critical_files_status": "OK" if all(
-                    (self.project_root / f).exists() for f in self.critical_files
-                ) else "ISSUES",
+                "critical_files_status": "OK" if not self._get_missing_files() else "ISSUES",
                 "dependencies_status": "OK" if not self.issues_found else "ISSUES",
                 "issues_found": self.issues_found,
                 "fixes_applied": self.fixes_applied,
@@ -282,8 +449,8 @@ class InteractiveNavigationMaintainer:
             
             # Sauvegarde du rapport
             report_file = self.project_root / f"maintenance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(maintenance_report, f, indent=2, ensure_ascii=False)
+            with open(report_file, 'wb') as f:
+                f.write(_dumps(maintenance_report))
                 
             self.log_action("DOC_SAVED", "SUCCESS", f"Rapport sauvegardé: {report_file.name}")
             return True
@@ -328,6 +495,8 @@ class InteractiveNavigationMaintainer:
             health_score -= len(self.issues_found) * 10
         health_score = max(0, health_score)
         
+        missing_files = self._get_missing_files()
+        
         report = {
             "maintenance_summary": {
                 "start_time": self.start_time.isoformat(),
@@ -340,8 +509,8 @@ class InteractiveNavigationMaintainer:
             },
             "critical_files": {
                 "total": len(self.critical_files),
-                "present": len([f for f in self.critical_files if (self.project_root / f).exists()]),
-                "missing": [f for f in self.critical_files if not (self.project_root / f).exists()]
+                "present": len(self.critical_files) - len(missing_files),
+                "missing": missing_files
             },
             "issues_detail": self.issues_found,
             "fixes_detail": self.fixes_applied,
@@ -397,6 +566,8 @@ class InteractiveNavigationMaintainer:
             except Exception as e:
                 self.log_action("TASK_ERROR", "ERROR", f"Erreur {task_name}: {e}")
                 
+        self._save_syntax_cache()
+        
         # Génération du rapport final
         health_report = self.generate_health_report()
         
@@ -473,9 +644,11 @@ def main():
     print("🔧 MAINTENANCE SYSTÈME - NAVIGATION INTERACTIVE GEMINI")
     print("🎯 Validation, nettoyage et optimisation automatiques")
     
-    maintainer = InteractiveNavigationMaintainer()
+    log_listener = _setup_logging()
     
     try:
+        maintainer = InteractiveNavigationMaintainer()
+        
         # Exécution complète de la maintenance
         health_report = maintainer.run_full_maintenance()
         
@@ -484,8 +657,8 @@ def main():
         
         # Sauvegarde du rapport
         report_file = f"health_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(health_report, f, indent=2, ensure_ascii=False)
+        with open(report_file, 'wb') as f:
+            f.write(_dumps(health_report))
         print(f"\n💾 Rapport complet sauvegardé: {report_file}")
         
         # Code de retour basé sur la santé
@@ -496,8 +669,12 @@ def main():
         print("\n\n⏹️ Maintenance interrompue par l'utilisateur")
         return False
     except Exception as e:
-        logger.error(f"💥 Erreur critique lors de la maintenance: {e}")
+        logger.error("💥 Erreur critique lors de la maintenance: %s", e)
         return False
+    finally:
+        # Vider la file de logs avant la sortie
+        if log_listener is not None:
+            log_listener.stop()
 
 if __name__ == "__main__":
     success = main()
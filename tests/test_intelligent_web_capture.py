@@ -0,0 +1,41 @@
+"""
+Test du découpage d'une page complète en sections de capture
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin pour l'import des modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intelligent_web_capture import IntelligentWebCapture
+
+class TestSectionPositions(unittest.TestCase):
+
+    def test_page_courte(self):
+        """Une seule section tant que la page tient dans 80% de la fenêtre"""
+        self.assertEqual(IntelligentWebCapture._section_positions(500, 1000), [0])
+        self.assertEqual(IntelligentWebCapture._section_positions(800, 1000), [0])
+        self.assertEqual(IntelligentWebCapture._section_positions(801, 1000), [0, 800])
+
+    def test_chevauchement_de_20_pourcent(self):
+        """Sections espacées de 80% de la fenêtre, la dernière alignée sur le bas de page"""
+        self.assertEqual(IntelligentWebCapture._section_positions(3000, 1000), [0, 800, 1600, 2400])
+        self.assertEqual(IntelligentWebCapture._section_positions(2000, 1000), [0, 800, 1600])
+
+    def test_page_vide(self):
+        """Aucune section pour une page de hauteur nulle"""
+        self.assertEqual(IntelligentWebCapture._section_positions(0, 1000), [])
+
+    def test_toute_la_page_couverte(self):
+        """Chaque pixel est couvert et chaque section commence dans la page"""
+        for total_height in range(1, 5000, 37):
+            positions = IntelligentWebCapture._section_positions(total_height, 768)
+            self.assertTrue(all(0 <= position < total_height for position in positions))
+            self.assertGreaterEqual(positions[-1] + 768, total_height)
+            for previous, current in zip(positions, positions[1:]):
+                self.assertLessEqual(current - previous, 768)
+
+if __name__ == '__main__':
+    unittest.main()
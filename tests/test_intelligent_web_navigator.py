@@ -0,0 +1,37 @@
+"""
+Test de la détection des mots-clés du navigateur web simplifié
+"""
+
+import unittest
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin pour l'import des modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intelligent_web_navigator import SimpleWebNavigator
+
+class TestKeywords(unittest.TestCase):
+
+    def setUp(self):
+        self.navigator = SimpleWebNavigator(scraper_instance=None)
+
+    def test_mots_entiers_et_pluriels(self):
+        """Mots entiers, insensibles à la casse, pluriel ramené au singulier"""
+        content = "Nos Formations et COURS : un guide, des tutorials, l'API REST et les principes."
+        self.assertEqual(self.navigator._find_keywords(content),
+                         {'formation', 'cours', 'guide', 'tutorial', 'api', 'principe'})
+
+    def test_frontieres_de_mots(self):
+        """Pas de correspondance au milieu d'un mot"""
+        content = "apiculture, newsletter, guidelines, recours, explications2024, reformation"
+        self.assertEqual(self.navigator._find_keywords(content), set())
+
+    def test_ponctuation(self):
+        """La ponctuation et les débuts/fins de texte délimitent les mots"""
+        self.assertEqual(self.navigator._find_keywords("news"), {'news'})
+        self.assertEqual(self.navigator._find_keywords("(documentation)-actualités."),
+                         {'documentation', 'actualité'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Test du calcul vectorisé des scores d'interaction (InteractiveElementAnalyzer)
+"""
+
+import unittest
+import tempfile
+import random
+import json
+import types
+import sys
+import os
+
+# Ajouter le répertoire parent au chemin pour l'import des modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interactive_web_navigator import InteractiveElementAnalyzer, InteractiveWebNavigator, NUMPY_AVAILABLE
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy non installé")
+class TestScoreBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = InteractiveElementAnalyzer()
+
+    def _scalar_scores(self, features):
+        """Scores calculés élément par élément par la version scalaire"""
+        return [
+            self.analyzer._calculate_interaction_score(
+                text,
+                {**({'id': 'x'} if has_id else {}), **({'aria-label': 'x'} if has_aria else {})},
+                element_type,
+                {'y': y, 'width': width, 'height': height}
+            )
+            for element_type, text, y, width, height, has_id, has_aria in zip(
+                features['types'], features['texts'], features['y'], features['width'],
+                features['height'], features['has_id'], features['has_aria']
+            )
+        ]
+
+    def test_cas_limites(self):
+        """Seuils exacts (y = 600, aire = 10000), type inconnu, score plafonné à 1.0"""
+        features = {
+            'types': ['buttons', 'links', 'inconnu', 'tabs', 'forms'],
+            'texts': ['Next', '', 'Login or Register', 'More details', 'Search help, go back'],
+            'y': [0, 600, 599, 10000, 50],
+            'width': [100, 100, 200, 1, 1000],
+            'height': [100, 101, 50, 1, 1000],
+            'has_id': [True, False, True, False, True],
+            'has_aria': [True, False, False, True, True]
+        }
+        batch = self.analyzer.score_batch(features).tolist()
+        self.assertEqual(batch, self._scalar_scores(features))
+        self.assertLessEqual(max(batch), 1.0)
+
+    def test_elements_aleatoires(self):
+        """Mêmes scores que la version scalaire sur une page générée aléatoirement"""
+        rng = random.Random(42)
+        element_types = list(InteractiveElementAnalyzer._TYPE_SCORES) + ['inconnu']
+        words = ['Next', 'Submit', 'More info', 'contact', 'texte', 'Home', 'cancel', '']
+        count = 500
+        features = {
+            'types': [rng.choice(element_types) for _ in range(count)],
+            'texts': [' '.join(rng.sample(words, 2)) for _ in range(count)],
+            'y': [rng.randint(0, 3000) for _ in range(count)],
+            'width': [rng.randint(0, 400) for _ in range(count)],
+            'height': [rng.randint(0, 100) for _ in range(count)],
+            'has_id': [rng.random() < 0.5 for _ in range(count)],
+            'has_aria': [rng.random() < 0.5 for _ in range(count)]
+        }
+        self.assertEqual(self.analyzer.score_batch(features).tolist(), self._scalar_scores(features))
+
+class NavigatorTestCase(unittest.TestCase):
+    """Navigateur créé dans un dossier temporaire, sans WebDriver réel"""
+
+    def setUp(self):
+        # Le navigateur crée son répertoire de captures dans le dossier courant
+        self._tmp = tempfile.TemporaryDirectory()
+        self._cwd = os.getcwd()
+        os.chdir(self._tmp.name)
+        self.navigator = InteractiveWebNavigator()
+
+    def tearDown(self):
+        self.navigator.shutdown()
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+class TestStatistics(NavigatorTestCase):
+
+    def test_statistiques_serialisables(self):
+        """Les statistiques passent par json.dumps et sont une copie des compteurs"""
+        stats = self.navigator.get_statistics()
+        self.assertEqual(json.loads(json.dumps(stats))['stats'], self.navigator.stats)
+        stats['stats']['sessions_created'] = 99
+        self.assertEqual(self.navigator.stats['sessions_created'], 0)
+
+class TestScreenshots(NavigatorTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.navigator.webdriver = types.SimpleNamespace(get_screenshot_as_png=lambda: b'png')
+
+    def test_chemin_rendu_apres_ecriture(self):
+        """Le chemin n'est disponible qu'une fois le fichier écrit"""
+        path = self.navigator._take_screenshot("test").result()
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), b'png')
+
+    def test_captures_apres_shutdown(self):
+        """Le pool d'écriture est recréé après shutdown() : les captures continuent"""
+        self.navigator._take_screenshot("avant").result()
+        self.navigator.shutdown()
+        path = self.navigator._take_screenshot("apres").result()
+        self.assertIsNotNone(path)
+        self.assertTrue(os.path.exists(path))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+"""
+Test de l'extraction des annonces Leboncoin (sans accès réseau)
+"""
+
+import unittest
+import json
+import sys
+import os
+import time
+
+# Ajouter le répertoire parent au chemin pour l'import des modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from leboncoin_search import LeboncoinSearcher, LXML_AVAILABLE
+
+LISTING_HTML = '''<html><head><title>Appartement 3 pièces 65 m²</title></head><body>
+<p>Annonce n° 2458796310, publiée le 12/03</p>
+<div data-qa-id="adview_price"><p>1 250 €</p></div>
+<span data-qa-id="adview_location_informations">Lyon 69003</span>
+<p>Charges : 80 €</p>
+</body></html>'''
+
+class TestPriceExtraction(unittest.TestCase):
+
+    def test_prix_formats_courants(self):
+        """Montants avec ou sans séparateur de milliers"""
+        self.assertEqual(LeboncoinSearcher._search_price("Loyer : 1 250 € / mois"), "1 250")
+        self.assertEqual(LeboncoinSearcher._search_price("1200€"), "1200")
+        self.assertEqual(LeboncoinSearcher._search_price("3 500 000\xa0€"), "3 500 000")
+        self.assertEqual(LeboncoinSearcher._search_price("réf 123456789012345, prix 650 €"), "650")
+
+    def test_premier_montant(self):
+        """Le premier « € » précédé d'un montant l'emporte ; le motif est ancré sur le « € »"""
+        self.assertEqual(LeboncoinSearcher._search_price("€ 12, puis 950 € et 1 000 €"), "950")
+        self.assertIsNone(LeboncoinSearcher._PRICE_RE.search("950 € de plus"))
+        self.assertEqual(LeboncoinSearcher._PRICE_RE.search("950 €").group(1), "950")
+
+    def test_suite_de_chiffres_trop_longue(self):
+        """Plus de 9 chiffres sans séparateur : aucun montant plutôt qu'un montant tronqué"""
+        self.assertIsNone(LeboncoinSearcher._search_price("1234567890 €"))
+        self.assertIsNone(LeboncoinSearcher._search_price("réf 1234567890€"))
+        # Suite plus longue que la fenêtre : le chiffre qui précède la fenêtre est vu aussi
+        self.assertIsNone(LeboncoinSearcher._search_price("1" * 40 + " €"))
+        self.assertEqual(LeboncoinSearcher._search_price("1234567890 €, soit 950 €"), "950")
+        self.assertEqual(LeboncoinSearcher._search_price("123456789 €"), "123456789")
+
+    def test_prix_absent(self):
+        """Pas de montant devant un « € », ou pas de « € » du tout"""
+        self.assertIsNone(LeboncoinSearcher._search_price("€ seulement"))
+        self.assertIsNone(LeboncoinSearcher._search_price("aucun prix ici"))
+
+    def test_entrees_pathologiques(self):
+        """Longues suites de chiffres sans « € » : temps borné (pas de retour arrière quadratique)"""
+        pathological = [
+            "1" * 200000,
+            "1 " * 100000 + "x",
+            "1" * 250000 + "€",
+            ("1 " * 100 + "€") * 1000
+        ]
+        start = time.perf_counter()
+        for text in pathological:
+            LeboncoinSearcher._search_price(text)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+class TestApartmentLinks(unittest.TestCase):
+
+    def setUp(self):
+        self.searcher = LeboncoinSearcher(cache_path=None)
+
+    def test_liens_relatifs_et_absolus(self):
+        """Liens relatifs complétés, doublons ignorés, ordre d'apparition conservé"""
+        html = (b'<a href="/ad/locations/111.htm">a</a>'
+                b'<a href="https://www.leboncoin.fr/ad/locations/222.htm">b</a>'
+                b'<a href="/ad/locations/111.htm">a bis</a>'
+                b'<a href="/recherche?category=10">recherche</a>'
+                b'<a HREF="/ad/locations/333.htm">c</a>')
+        self.assertEqual(self.searcher._extract_apartment_links(html), [
+            "https://www.leboncoin.fr/ad/locations/111.htm",
+            "https://www.leboncoin.fr/ad/locations/222.htm",
+            "https://www.leboncoin.fr/ad/locations/333.htm"
+        ])
+
+    def test_limite_et_exclusion(self):
+        """Arrêt dès limit liens nouveaux, les liens exclus n'étant pas comptés"""
+        html = b''.join(b'<a href="/ad/locations/%d.htm">x</a>' % i for i in range(50))
+        excluded = {"https://www.leboncoin.fr/ad/locations/0.htm", "https://www.leboncoin.fr/ad/locations/1.htm"}
+        links = self.searcher._extract_apartment_links(html, limit=3, exclude=excluded)
+        self.assertEqual(links, [f"https://www.leboncoin.fr/ad/locations/{i}.htm" for i in (2, 3, 4)])
+
+class TestFieldExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.searcher = LeboncoinSearcher(cache_path=None)
+
+    def test_next_data(self):
+        """Champs lus dans le JSON __NEXT_DATA__, prix entier formaté comme sur la page"""
+        ad = {'subject': ' Studio meublé ', 'price': [1250], 'location': {'city': 'Lyon', 'zipcode': '69003'}}
+        content = ('<script id="__NEXT_DATA__" type="application/json">'
+                   + json.dumps({'props': {'pageProps': {'ad': ad}}}) + '</script>')
+        self.assertEqual(self.searcher._extract_fields_next_data(content), ("Studio meublé", "1 250 €", "Lyon 69003"))
+
+    def test_next_data_absent_ou_incomplet(self):
+        """None si le bloc manque, est tronqué ou n'a pas tous les champs"""
+        self.assertIsNone(self.searcher._extract_fields_next_data(LISTING_HTML))
+        self.assertIsNone(self.searcher._extract_fields_next_data(
+            '<script id="__NEXT_DATA__">{"props": {"pageProps"</script>'))
+        self.assertIsNone(self.searcher._extract_fields_next_data(
+            '<script id="__NEXT_DATA__">' + json.dumps({'props': {'pageProps': {'ad': {'subject': 'x'}}}}) + '</script>'))
+
+    def test_regex(self):
+        """Premier montant suivi de « € » sur la page, identifiants ignorés"""
+        self.assertEqual(self.searcher._extract_fields_regex(LISTING_HTML),
+                         ("Appartement 3 pièces 65 m²", "1 250 €", "Lyon 69003"))
+
+    def test_regex_valeurs_par_defaut(self):
+        """Valeurs par défaut quand aucun champ n'est trouvé"""
+        self.assertEqual(self.searcher._extract_fields_regex("<html></html>"),
+                         ("Appartement", "Prix non spécifié", "Localisation non spécifiée"))
+
+    @unittest.skipUnless(LXML_AVAILABLE, "lxml non installé")
+    def test_lxml_identique_a_regex(self):
+        """L'extraction lxml donne les mêmes champs que les expressions régulières"""
+        self.assertEqual(self.searcher._extract_fields_lxml(LISTING_HTML),
+                         self.searcher._extract_fields_regex(LISTING_HTML))
+
+    @unittest.skipUnless(LXML_AVAILABLE, "lxml non installé")
+    def test_lxml_prix_du_noeud_de_prix(self):
+        """Le prix vient du nœud de prix, même si un autre montant le précède dans la page"""
+        content = LISTING_HTML.replace('<p>Annonce', '<p>Frais de dossier 300 €</p><p>Annonce')
+        self.assertEqual(self.searcher._extract_fields_lxml(content)[1], "1 250 €")
+        self.assertEqual(self.searcher._extract_fields_regex(content)[1], "300 €")
+
+if __name__ == '__main__':
+    unittest.main()
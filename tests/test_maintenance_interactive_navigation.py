@@ -0,0 +1,123 @@
+"""
+Test des utilitaires du script de maintenance (nettoyage, vérification des fichiers)
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+from pathlib import Path
+
+# Ajouter le répertoire parent au chemin pour l'import des modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maintenance_interactive_navigation import _iter_cleanup_targets, _check_one_file
+
+# Motifs glob remplacés par le parcours unique de _iter_cleanup_targets
+TEMP_PATTERNS = [
+    '**/*.pyc',
+    '**/__pycache__',
+    '**/.pytest_cache',
+    '**/cache/*',
+    '**/test_results_*/*.png',
+    '**/logs/*.log.old'
+]
+
+class TestCleanupTargets(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        for relative in [
+            'module.py', 'module.pyc', 'pkg/sub/deep.pyc', 'pkg/sub/keep.py',
+            'pkg/__pycache__/module.cpython-312.pyc', '.pytest_cache/v/cache/lastfailed',
+            'cache/page.html', 'cache/nested/data.json', 'pkg/cache/entry.bin',
+            'test_results_20240101/shot.png', 'test_results_20240101/report.json',
+            'test_results/shot.png', 'logs/app.log.old', 'logs/app.log', 'other/app.log.old',
+            'data/cache.png'
+        ]:
+            path = self.root / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b'x')
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_equivalent_aux_motifs_glob(self):
+        """Mêmes suppressions que les motifs glob (le contenu des dossiers supprimés part avec eux)"""
+        targets = {Path(entry.path) for entry in _iter_cleanup_targets(str(self.root))}
+        matched = {path for pattern in TEMP_PATTERNS for path in self.root.glob(pattern)}
+        
+        # Chaque cible correspond à un motif
+        self.assertLessEqual(targets, matched)
+        # Chaque correspondance est une cible ou se trouve dans un dossier ciblé
+        for path in matched:
+            self.assertTrue(path in targets or any(parent in targets for parent in path.parents), path)
+        # Aucune cible n'est dans un dossier déjà ciblé
+        for path in targets:
+            self.assertFalse(any(parent in targets for parent in path.parents), path)
+
+    def test_fichiers_conserves(self):
+        """Les fichiers hors motifs ne sont jamais produits"""
+        names = {Path(entry.path).relative_to(self.root).as_posix() for entry in _iter_cleanup_targets(str(self.root))}
+        for kept in ['module.py', 'pkg/sub/keep.py', 'test_results_20240101/report.json',
+                     'test_results/shot.png', 'logs/app.log', 'other/app.log.old', 'data/cache.png']:
+            self.assertNotIn(kept, names)
+
+    def test_racine_absente(self):
+        """Une racine inexistante ne produit rien"""
+        self.assertEqual(list(_iter_cleanup_targets(str(self.root / 'absent'))), [])
+
+class TestCheckOneFile(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, content):
+        path = self.root / name
+        path.write_bytes(content)
+        return str(path)
+
+    def test_statuts(self):
+        """MISSING, EMPTY, SYNTAX_ERROR, SYNTAX_OK et OK"""
+        self.assertEqual(_check_one_file(str(self.root / 'absent.py'), 'absent.py'), ('absent.py', 'MISSING', None, None))
+        self.assertEqual(_check_one_file(self._write('vide.py', b''), 'vide.py'), ('vide.py', 'EMPTY', None, None))
+        
+        file, status, error, signature = _check_one_file(self._write('faux.py', b'def f(:\n'), 'faux.py')
+        self.assertEqual((status, signature), ('SYNTAX_ERROR', None))
+        self.assertTrue(error)
+        
+        full_path = self._write('ok.py', b'# -*- coding: latin-1 -*-\ns = "\xe9t\xe9"\n')
+        file, status, error, signature = _check_one_file(full_path, 'ok.py')
+        stat = os.stat(full_path)
+        self.assertEqual((status, error, signature), ('SYNTAX_OK', None, [stat.st_mtime_ns, stat.st_size]))
+        
+        self.assertEqual(_check_one_file(self._write('config.json', b'{}'), 'config.json'), ('config.json', 'OK', None, None))
+
+    def test_signature_connue_sans_reanalyse(self):
+        """Fichier inchangé depuis la dernière vérification : pas de réanalyse"""
+        full_path = self._write('module.py', b'x = 1\n')
+        signature = _check_one_file(full_path, 'module.py')[3]
+        
+        # Contenu invalide mais même mtime et même taille : la signature connue suffit
+        stat = os.stat(full_path)
+        Path(full_path).write_bytes(b'x = (\n')
+        os.utime(full_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(_check_one_file(full_path, 'module.py', signature), ('module.py', 'SYNTAX_OK', None, signature))
+        
+        # Sans signature connue, le fichier est réanalysé
+        self.assertEqual(_check_one_file(full_path, 'module.py')[1], 'SYNTAX_ERROR')
+
+    def test_signature_perimee(self):
+        """Un fichier modifié (taille ou date) est réanalysé"""
+        full_path = self._write('module.py', b'x = 1\n')
+        signature = _check_one_file(full_path, 'module.py')[3]
+        Path(full_path).write_bytes(b'x = (1\n')
+        self.assertEqual(_check_one_file(full_path, 'module.py', signature)[1], 'SYNTAX_ERROR')
+
+if __name__ == '__main__':
+    unittest.main()